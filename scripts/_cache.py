@@ -0,0 +1,98 @@
+"""On-disk cache for documents fetched by the debug and live-test scripts.
+
+Repeated runs of the scripts keep fetching the same CELEX IDs; caching the
+HTML on disk makes warm runs skip the network (and the WAF) entirely. Once an
+entry expires it is revalidated with a conditional GET (``If-None-Match`` /
+``If-Modified-Since``), so unchanged documents only cost a 304 round trip.
+
+Entries are keyed on ``(celex_id, language, eurlxp.__version__)`` so that
+upgrading the library invalidates them. Set ``EURLXP_SCRIPT_CACHE`` to change
+the cache directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import eurlxp as el
+import httpx
+from eurlxp.client import EURLEX_HTML_URL, _fetch_html_via_sparql, _is_waf_challenge
+
+CACHE_DIR = Path(os.environ.get("EURLXP_SCRIPT_CACHE", "/tmp/eurlxp-cache"))
+CACHE_EXPIRE = 86400.0
+
+
+def _cache_path(celex_id: str, language: str) -> Path:
+    key = f"{celex_id}|{language}|{el.__version__}".encode()
+    return CACHE_DIR / f"{hashlib.sha256(key).hexdigest()}.html"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+def _conditional_get(client: el.EURLexClient, url: str, headers: dict[str, str]) -> httpx.Response:
+    """GET through the client's pooled connection, treating 304 as success."""
+    if not headers:
+        return client._request_with_retry(url)
+    client._apply_rate_limit()
+    response = client._get_client().get(url, headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def fetch(celex_id: str, language: str = "en", client: el.EURLexClient | None = None) -> str:
+    """Return the HTML for a CELEX ID, serving it from disk when fresh.
+
+    Pass ``client`` to reuse an open session (keep-alive, WAF cookies) across fetches.
+    """
+    path = _cache_path(celex_id, language)
+    meta_path = path.with_suffix(".json")
+    cached: str | None = None
+    validators: dict[str, str] = {}
+    try:
+        cached = path.read_text(encoding="utf-8")
+        if time.time() - path.stat().st_mtime < CACHE_EXPIRE:
+            return cached
+        validators = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    url = EURLEX_HTML_URL.format(lang=language.upper(), celex_id=celex_id)
+    if client is None:
+        with el.EURLexClient() as own_client:
+            response = _conditional_get(own_client, url, headers)
+    else:
+        response = _conditional_get(client, url, headers)
+
+    if cached is not None and (response.status_code == 304 or _is_waf_challenge(response.text)):
+        path.touch()
+        return cached
+
+    html = response.text
+    validators = {}
+    if _is_waf_challenge(html):
+        html = _fetch_html_via_sparql(celex_id, language)
+    else:
+        validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_atomic(path, html)
+    _write_atomic(meta_path, json.dumps(validators))
+    return html
@@ -1,52 +1,76 @@
 #!/usr/bin/env python3
 """Debug script to investigate parser issues with different EUR-Lex document formats."""
 
+import io
+import sys
+from collections import Counter
+
 import eurlxp as el
-from bs4 import BeautifulSoup
-from xml.etree import ElementTree as ETree
+from _cache import fetch
+from lxml import etree
+
+_XML_PARSER = etree.XMLParser(recover=True, huge_tree=True, remove_comments=True)
+# Embedded assets that carry no document structure
+_IGNORED_TAGS = ("{*}script", "{*}style", "{*}noscript", "{*}link")
+# Anything shorter is a stub (error page, empty fallback), not a real document
+MIN_DOCUMENT_LENGTH = 2048
+TEXT_CLASSES = frozenset({"normal", "oj-normal", "Normal", "doc-ti", "oj-doc-ti", "Titreobjet"})
 
 
 def analyze_document(celex_id: str) -> None:
     """Analyze a document's structure and parsing results."""
-    print(f"\n{'='*60}")
-    print(f"Analyzing: {celex_id}")
-    print(f"{'='*60}")
+    # Build the report in memory and write it out once
+    buf = io.StringIO()
+    w = buf.write
+    w(f"\n{'='*60}\nAnalyzing: {celex_id}\n{'='*60}\n")
 
-    html = el.get_html_by_celex_id(celex_id)
-    print(f"HTML length: {len(html)} bytes")
+    html = fetch(celex_id)
+    w(f"HTML length: {len(html)} bytes\n")
+    if len(html) < MIN_DOCUMENT_LENGTH:
+        w("Stub/placeholder document, skipping structural analysis\n")
+        sys.stdout.write(buf.getvalue())
+        return
 
-    # Find all unique CSS classes
-    soup = BeautifulSoup(html, "lxml-xml")
-    all_classes: set[str] = set()
-    for tag in soup.find_all(True):
-        css_class = tag.get("class")
-        if css_class:
-            if isinstance(css_class, list):
-                all_classes.update(css_class)
-            else:
-                all_classes.add(css_class)
+    root = etree.fromstring(html.encode("utf-8"), parser=_XML_PARSER)
+    # The recovering parser returns None instead of raising when nothing is salvageable
+    if root is None:
+        w("Unparseable document, skipping structural analysis\n")
+        sys.stdout.write(buf.getvalue())
+        return
+    etree.strip_elements(root, *_IGNORED_TAGS, with_tail=False)
+    # Single walk: tally every class, and the text-bearing <p> classes alongside
+    class_counts: Counter[str] = Counter()
+    p_class_counts: Counter[str] = Counter()
+    for elem in root.iter(etree.Element):
+        classes = set(elem.get("class", "").split())
+        if not classes:
+            continue
+        class_counts.update(classes)
+        if etree.QName(elem).localname == "p":
+            for tok in classes:
+                if tok in TEXT_CLASSES:
+                    p_class_counts[tok] += 1
 
-    print(f"\nUnique CSS classes ({len(all_classes)}):")
-    for c in sorted(all_classes):
-        count = len(soup.find_all(True, class_=c))
-        if count > 0:
-            print(f"  {c}: {count}")
+    w(f"\nUnique CSS classes ({len(class_counts)}):\n")
+    for c, count in sorted(class_counts.items()):
+        w(f"  {c}: {count}\n")
 
     # Count potential text-bearing elements
-    text_classes = ["normal", "oj-normal", "Normal", "doc-ti", "oj-doc-ti", "Titreobjet"]
-    print(f"\nText-bearing elements (BeautifulSoup):")
-    for cls in text_classes:
-        elements = soup.find_all("p", class_=cls)
-        if elements:
-            print(f"  p.{cls}: {len(elements)}")
+    w("\nText-bearing elements:\n")
+    for cls, count in sorted(p_class_counts.items()):
+        w(f"  p.{cls}: {count}\n")
 
-    # Parse with current parser
-    df = el.parse_html(html)
-    print(f"\nParser result: {df.shape[0]} rows")
+    # Parse with current parser, reusing the tree parsed above. Old HTML
+    # documents that don't survive the XML parse go through parse_html's
+    # HTML fallback instead.
+    df = el.parse_tree(root) if root.find(".//{*}p") is not None else el.parse_html(html)
+    w(f"\nParser result: {df.shape[0]} rows\n")
     if len(df) > 0:
-        print(f"  First: {df.iloc[0]['text'][:60]}...")
+        w(f"  First: {df[0, 'text'][:60]}...\n")
         if len(df) > 1:
-            print(f"  Last: {df.iloc[-1]['text'][:60]}...")
+            w(f"  Last: {df[-1, 'text'][:60]}...\n")
+
+    sys.stdout.write(buf.getvalue())
 
 
 if __name__ == "__main__":
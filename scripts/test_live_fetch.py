@@ -21,10 +21,22 @@ from __future__ import annotations
 
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+_RULE = "=" * 60
+
+
+def _banner(title: str) -> str:
+    """Compose a section banner so it is emitted as a single log record."""
+    return f"{_RULE}\n{title}\n{_RULE}"
+
+
+# Keep concurrency low so parallel fetches don't trip the EUR-Lex WAF
+MAX_WORKERS = 4
+
 
 # Test documents with different ID formats - multiple options per type for resilience
 TEST_CELEX_IDS = [
@@ -40,9 +52,7 @@ def test_detect_id_type() -> bool:
     """Test that detect_id_type correctly identifies all formats."""
     from eurlxp import detect_id_type
 
-    logger.info("=" * 60)
-    logger.info("Test 1: detect_id_type() correctly identifies formats")
-    logger.info("=" * 60)
+    logger.info("%s", _banner("Test 1: detect_id_type() correctly identifies formats"))
 
     test_cases = [
         ("32019R0947", "celex"),
@@ -61,7 +71,7 @@ def test_detect_id_type() -> bool:
         status = "✓" if result == expected_type else "✗"
         if result != expected_type:
             all_passed = False
-        logger.info(f"  {status} detect_id_type('{identifier}') = '{result}' (expected: '{expected_type}')")
+        logger.info("  %s detect_id_type('%s') = '%s' (expected: '%s')", status, identifier, result, expected_type)
 
     return all_passed
 
@@ -73,28 +83,36 @@ def test_get_html_celex() -> bool:
     """
     from eurlxp import WAFChallengeError, get_html, parse_html
 
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Test 2: get_html() with CELEX IDs")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Test 2: get_html() with CELEX IDs"))
+
+    def fetch_and_parse(identifier: str) -> tuple[int, int]:
+        html = get_html(identifier)
+        return len(html), len(parse_html(html))
 
     successes = 0
-    for identifier, description in TEST_CELEX_IDS:
-        try:
-            logger.info(f"  Fetching {identifier} ({description})...")
-            html = get_html(identifier)
-            df = parse_html(html)
-            logger.info(f"  ✓ {identifier}: {len(html):,} bytes, {len(df)} rows")
-            successes += 1
-            if successes >= 2:  # Success if we get at least 2
-                break
-        except WAFChallengeError:
-            logger.warning(f"  ⚠ {identifier}: WAF challenge (will try next)")
-        except Exception as e:
-            logger.warning(f"  ⚠ {identifier}: {type(e).__name__} (will try next)")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for identifier, description in TEST_CELEX_IDS:
+            logger.info("  Fetching %s (%s)...", identifier, description)
+            futures[executor.submit(fetch_and_parse, identifier)] = identifier
+
+        for future in as_completed(futures):
+            identifier = futures[future]
+            try:
+                html_length, rows = future.result()
+                logger.info("  ✓ %s: %s bytes, %s rows", identifier, f"{html_length:,}", rows)
+                successes += 1
+                if successes >= 2:  # Success if we get at least 2
+                    for pending in futures:
+                        pending.cancel()
+                    break
+            except WAFChallengeError:
+                logger.warning("  ⚠ %s: WAF challenge (will try next)", identifier)
+            except Exception as e:
+                logger.warning("  ⚠ %s: %s (will try next)", identifier, type(e).__name__)
 
     if successes > 0:
-        logger.info(f"  → {successes} CELEX ID(s) fetched successfully")
+        logger.info("  → %s CELEX ID(s) fetched successfully", successes)
         return True
     else:
         logger.error("  ✗ All CELEX IDs failed")
@@ -108,16 +126,13 @@ def test_get_html_cellar_url() -> bool:
     """
     from eurlxp import WAFChallengeError, get_html, get_ids_and_urls_via_date, parse_html
 
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Test 3: get_html() with Cellar URLs")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Test 3: get_html() with Cellar URLs"))
 
     try:
         # Get some real cellar URLs from SPARQL - try multiple dates
         docs = []
         for date in ["2024-03-15", "2024-06-15", "2024-09-15"]:
-            logger.info(f"  Fetching document references for {date}...")
+            logger.info("  Fetching document references for %s...", date)
             try:
                 docs = get_ids_and_urls_via_date(date)
                 if docs:
@@ -133,20 +148,20 @@ def test_get_html_cellar_url() -> bool:
         successes = 0
         for doc in docs[:5]:
             try:
-                logger.info(f"  Fetching {doc.raw_id} via cellar URL...")
+                logger.info("  Fetching %s via cellar URL...", doc.raw_id)
                 html = get_html(doc.cellar_url)
                 df = parse_html(html)
-                logger.info(f"  ✓ {doc.raw_id}: {len(html):,} bytes, {len(df)} rows")
+                logger.info("  ✓ %s: %s bytes, %s rows", doc.raw_id, f"{len(html):,}", len(df))
                 successes += 1
                 if successes >= 1:  # Just need one success
                     break
             except WAFChallengeError:
-                logger.warning(f"  ⚠ {doc.raw_id}: WAF challenge (will try next)")
+                logger.warning("  ⚠ %s: WAF challenge (will try next)", doc.raw_id)
             except Exception as e:
-                logger.warning(f"  ⚠ {doc.raw_id}: {type(e).__name__} (will try next)")
+                logger.warning("  ⚠ %s: %s (will try next)", doc.raw_id, type(e).__name__)
 
         if successes > 0:
-            logger.info(f"  → {successes} cellar URL(s) fetched successfully")
+            logger.info("  → %s cellar URL(s) fetched successfully", successes)
             return True
         else:
             logger.error("  ✗ All cellar URLs failed (likely transient server issues)")
@@ -156,18 +171,15 @@ def test_get_html_cellar_url() -> bool:
         logger.warning("  ⚠ SPARQL dependencies not installed, skipping cellar URL test")
         return True
     except Exception as e:
-        logger.error(f"  ✗ Error: {e}")
+        logger.error("  ✗ Error: %s", e)
         return False
 
 
 def test_get_html_oj_reference() -> bool:
     """Test get_html() with OJ references (looked up via SPARQL)."""
-    from eurlxp import get_html, lookup_cellar_url, parse_html
+    from eurlxp import get_html, lookup_cellar_urls, parse_html
 
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Test 4: get_html() with OJ References (SPARQL lookup)")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Test 4: get_html() with OJ References (SPARQL lookup)"))
 
     try:
         # First, let's find a real OJ reference from recent documents
@@ -180,30 +192,31 @@ def test_get_html_oj_reference() -> bool:
 
         if not oj_refs:
             logger.info("  No OJ references found in test date range")
-            # Try the lookup_cellar_url function directly with a known pattern
-            logger.info("  Testing lookup_cellar_url() directly...")
-            url = lookup_cellar_url("32019R0947")  # Known CELEX to verify SPARQL works
-            if url:
-                logger.info(f"  ✓ lookup_cellar_url('32019R0947') = {url}")
-            else:
-                logger.warning("  ⚠ lookup_cellar_url returned None")
+            # Look up the known CELEX IDs in one batched query to verify SPARQL works
+            logger.info("  Testing lookup_cellar_urls() directly...")
+            urls = lookup_cellar_urls([celex_id for celex_id, _ in TEST_CELEX_IDS])
+            for celex_id, url in urls.items():
+                if url:
+                    logger.info("  ✓ lookup_cellar_urls: %s = %s", celex_id, url)
+                else:
+                    logger.warning("  ⚠ lookup_cellar_urls: %s returned None", celex_id)
             return True
 
         # Test with an OJ reference
         oj_ref = oj_refs[0]
-        logger.info(f"  Found OJ reference: {oj_ref.raw_id}")
-        logger.info(f"  Cellar URL: {oj_ref.cellar_url}")
+        logger.info("  Found OJ reference: %s", oj_ref.raw_id)
+        logger.info("  Cellar URL: %s", oj_ref.cellar_url)
 
         # Now test get_html with the OJ reference raw_id
-        logger.info(f"  Fetching via get_html('{oj_ref.raw_id}')...")
+        logger.info("  Fetching via get_html('%s')...", oj_ref.raw_id)
         try:
             html = get_html(oj_ref.raw_id)
             df = parse_html(html)
-            logger.info(f"  ✓ {oj_ref.raw_id}: {len(html):,} bytes, {len(df)} rows")
+            logger.info("  ✓ %s: %s bytes, %s rows", oj_ref.raw_id, f"{len(html):,}", len(df))
             return True
         except ValueError as e:
             if "SPARQL lookup found no results" in str(e):
-                logger.warning(f"  ⚠ {oj_ref.raw_id}: SPARQL lookup failed (expected for some OJ refs)")
+                logger.warning("  ⚠ %s: SPARQL lookup failed (expected for some OJ refs)", oj_ref.raw_id)
                 return True
             raise
 
@@ -211,7 +224,7 @@ def test_get_html_oj_reference() -> bool:
         logger.warning("  ⚠ SPARQL dependencies not installed, skipping OJ reference test")
         return True
     except Exception as e:
-        logger.error(f"  ✗ Error: {e}")
+        logger.error("  ✗ Error: %s", e)
         return False
 
 
@@ -219,10 +232,7 @@ def test_fetch_documents_mixed() -> bool:
     """Test fetch_documents() with mixed identifier types."""
     from eurlxp import fetch_documents
 
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Test 5: fetch_documents() with mixed ID types")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Test 5: fetch_documents() with mixed ID types"))
 
     # Mix of ID types
     identifiers = [
@@ -231,33 +241,36 @@ def test_fetch_documents_mixed() -> bool:
     ]
 
     try:
-        logger.info(f"  Fetching {len(identifiers)} documents...")
+        logger.info("  Fetching %s documents...", len(identifiers))
         results = fetch_documents(identifiers, on_error="include")
 
-        successes = sum(1 for v in results.values() if isinstance(v, str))
-        failures = sum(1 for v in results.values() if isinstance(v, Exception))
+        # Tally and render in one pass over the results
+        successes = failures = 0
+        rows = []
+        for identifier, result in results.items():
+            ok = isinstance(result, str)
+            successes += ok
+            failures += not ok
+            rows.append((ok, identifier, result))
 
-        logger.info(f"  Results: {successes} succeeded, {failures} failed")
+        logger.info("  Results: %s succeeded, %s failed", successes, failures)
 
-        for identifier, result in results.items():
-            if isinstance(result, str):
-                logger.info(f"  ✓ {identifier}: {len(result):,} bytes")
+        for ok, identifier, result in rows:
+            if ok:
+                logger.info("  ✓ %s: %s bytes", identifier, f"{len(result):,}")
             else:
-                logger.warning(f"  ⚠ {identifier}: {result}")
+                logger.warning("  ⚠ %s: %s", identifier, result)
 
         return successes > 0
 
     except Exception as e:
-        logger.error(f"  ✗ Error: {e}")
+        logger.error("  ✗ Error: %s", e)
         return False
 
 
 def test_cleanup() -> None:
     """Clean up any temporary files."""
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Cleanup")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Cleanup"))
     logger.info("  No temporary files to clean up")
 
 
@@ -279,20 +292,17 @@ def main() -> int:
     test_cleanup()
 
     # Summary
-    logger.info("")
-    logger.info("=" * 60)
-    logger.info("Summary")
-    logger.info("=" * 60)
+    logger.info("\n%s", _banner("Summary"))
 
     passed = sum(1 for _, r in results if r)
     total = len(results)
 
     for name, result in results:
         status = "✓ PASS" if result else "✗ FAIL"
-        logger.info(f"  {status}: {name}")
+        logger.info("  %s: %s", status, name)
 
     logger.info("")
-    logger.info(f"Total: {passed}/{total} tests passed")
+    logger.info("Total: %s/%s tests passed", passed, total)
 
     return 0 if passed == total else 1
 
@@ -16,36 +16,68 @@ from __future__ import annotations
 
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from eurlxp import EURLexClient
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# The tests run concurrently; each one's log records are held here and replayed in order
+_buffer = threading.local()
+
+
+def _hold_records(record: logging.LogRecord) -> bool:
+    """Logger filter that diverts records from a running test into its buffer."""
+    records = getattr(_buffer, "records", None)
+    if records is None:
+        return True
+    records.append(record)
+    return False
 
-def test_with_sparql_fallback() -> None:
-    """Test fetching with SPARQL fallback enabled (default)."""
-    from eurlxp import ClientConfig, EURLexClient
 
+logger.addFilter(_hold_records)
+
+
+def _run_captured(test: Callable[..., None], *args: object) -> list[logging.LogRecord]:
+    """Run a test in the current thread and return the records it logged."""
+    _buffer.records = records = []
+    try:
+        test(*args)
+    finally:
+        del _buffer.records
+    return records
+
+
+def test_with_sparql_fallback(client: EURLexClient) -> None:
+    """Test fetching with SPARQL fallback enabled (default)."""
     logger.info("=" * 60)
     logger.info("Test 1: Fetching with SPARQL fallback ENABLED (default)")
     logger.info("=" * 60)
 
-    config = ClientConfig(sparql_fallback=True)
-    with EURLexClient(config=config) as client:
-        try:
-            html = client.get_html_by_celex_id("32019R0947")
-            if "SPARQL fallback" in html:
-                logger.info("✓ WAF detected, SPARQL fallback was used")
-                logger.info("  Returned minimal HTML from SPARQL metadata")
-            else:
-                logger.info("✓ Direct HTML fetch succeeded (no WAF block)")
-            logger.info(f"  HTML length: {len(html)} characters")
-            logger.info(f"  First 200 chars: {html[:200]}...")
-        except Exception as e:
-            logger.error(f"✗ Unexpected error: {e}")
+    try:
+        html = client.get_html_by_celex_id("32019R0947")
+        if "SPARQL fallback" in html:
+            logger.info("✓ WAF detected, SPARQL fallback was used")
+            logger.info("  Returned minimal HTML from SPARQL metadata")
+        else:
+            logger.info("✓ Direct HTML fetch succeeded (no WAF block)")
+        logger.info("  HTML length: %s characters", len(html))
+        logger.info("  First 200 chars: %s...", html[:200])
+    except Exception as e:
+        logger.error("✗ Unexpected error: %s", e)
 
 
 def test_without_sparql_fallback() -> None:
-    """Test fetching with SPARQL fallback disabled."""
+    """Test fetching with SPARQL fallback disabled.
+
+    Uses its own client since the shared one has the fallback enabled.
+    """
     from eurlxp import ClientConfig, EURLexClient, WAFChallengeError
 
     logger.info("")
@@ -58,12 +90,12 @@ def test_without_sparql_fallback() -> None:
         try:
             html = client.get_html_by_celex_id("32019R0947")
             logger.info("✓ Direct HTML fetch succeeded (no WAF block)")
-            logger.info(f"  HTML length: {len(html)} characters")
+            logger.info("  HTML length: %s characters", len(html))
         except WAFChallengeError as e:
             logger.info("✓ WAFChallengeError raised as expected when fallback disabled")
-            logger.info(f"  Error: {e}")
+            logger.info("  Error: %s", e)
         except Exception as e:
-            logger.error(f"✗ Unexpected error: {e}")
+            logger.error("✗ Unexpected error: %s", e)
 
 
 def test_sparql_fallback_fetches_real_content() -> None:
@@ -79,7 +111,7 @@ def test_sparql_fallback_fetches_real_content() -> None:
 
         # Test with a known document
         celex_id = "32025L0002"
-        logger.info(f"Testing _fetch_html_via_sparql('{celex_id}')...")
+        logger.info("Testing _fetch_html_via_sparql('%s')...", celex_id)
 
         html = _fetch_html_via_sparql(celex_id, "en")
 
@@ -88,28 +120,28 @@ def test_sparql_fallback_fetches_real_content() -> None:
             logger.error("✗ SPARQL fallback returned placeholder HTML instead of real content!")
             return
 
-        logger.info(f"✓ Fetched {len(html)} bytes of HTML")
-        logger.info(f"  First 150 chars: {html[:150]}...")
+        logger.info("✓ Fetched %s bytes of HTML", len(html))
+        logger.info("  First 150 chars: %s...", html[:150])
 
         # Parse and verify we get actual content
         df = parse_html(html)
-        logger.info(f"✓ Parsed to DataFrame with {len(df)} rows")
+        logger.info("✓ Parsed to DataFrame with %s rows", len(df))
 
         if len(df) > 0:
-            first_text = df.iloc[0]["text"][:80] if len(df.iloc[0]["text"]) > 80 else df.iloc[0]["text"]
-            logger.info(f"  First row text: {first_text}...")
+            first_text = df[0, "text"][:80]
+            logger.info("  First row text: %s...", first_text)
             logger.info("✓ SPARQL fallback successfully fetches real document content!")
         else:
             logger.warning("⚠ DataFrame is empty - parsing may have issues")
 
     except ImportError as e:
-        logger.warning(f"✗ SPARQL dependencies not installed: {e}")
+        logger.warning("✗ SPARQL dependencies not installed: %s", e)
         logger.warning("  Run: pip install eurlxp[sparql]")
     except Exception as e:
-        logger.error(f"✗ Error: {e}")
+        logger.error("✗ Error: %s", e)
 
 
-def test_parser_different_formats() -> None:
+def test_parser_different_formats(client: EURLexClient) -> None:
     """Test parser with different EUR-Lex document formats."""
     logger.info("")
     logger.info("=" * 60)
@@ -118,6 +150,7 @@ def test_parser_different_formats() -> None:
 
     try:
         import eurlxp as el
+        from _cache import fetch
 
         test_cases = [
             ("2026/2", "Commission proposal format"),
@@ -125,29 +158,29 @@ def test_parser_different_formats() -> None:
         ]
 
         for slash_notation, description in test_cases:
-            logger.info(f"\nTesting {slash_notation} ({description})...")
+            logger.info("\nTesting %s (%s)...", slash_notation, description)
             possible_docs = el.guess_celex_ids_via_eurlex(slash_notation)
-            logger.info(f"  Found CELEX IDs: {possible_docs[:3]}")
+            logger.info("  Found CELEX IDs: %s", possible_docs[:3])
 
-            for doc in possible_docs[:2]:  # Test first 2
+            # Fetch the first 2 one at a time: the shared client isn't thread-safe
+            for doc in possible_docs[:2]:
                 try:
-                    html = el.get_html_by_celex_id(doc)
-                    df = el.parse_html(html)
-                    logger.info(f"  {doc}: {df.shape} columns={df.columns.tolist()}")
+                    df = el.parse_html(fetch(doc, client=client))
+                    logger.info("  %s: %s columns=%s", doc, df.shape, df.columns)
                     if len(df) > 0:
-                        first_text = df.iloc[0]["text"][:60]
-                        logger.info(f"    First: {first_text}...")
+                        first_text = df[0, "text"][:60]
+                        logger.info("    First: %s...", first_text)
                     else:
-                        logger.warning(f"    ⚠ Empty DataFrame")
+                        logger.warning("    ⚠ Empty DataFrame")
                 except Exception as e:
-                    logger.error(f"  {doc}: Error - {e}")
+                    logger.error("  %s: Error - %s", doc, e)
 
         logger.info("✓ Parser format tests complete")
 
     except ImportError as e:
-        logger.warning(f"✗ Dependencies not installed: {e}")
+        logger.warning("✗ Dependencies not installed: %s", e)
     except Exception as e:
-        logger.error(f"✗ Error: {e}")
+        logger.error("✗ Error: %s", e)
 
 
 def test_pdf_extraction() -> None:
@@ -163,25 +196,25 @@ def test_pdf_extraction() -> None:
 
         # Test with a 1983 document that only has PDF
         celex_id = "31983R0002"
-        logger.info(f"Testing PDF extraction for {celex_id}...")
+        logger.info("Testing PDF extraction for %s...", celex_id)
 
         html = _fetch_html_via_sparql(celex_id, "en", include_pdf=True)
-        logger.info(f"✓ Fetched {len(html)} bytes via PDF extraction")
+        logger.info("✓ Fetched %s bytes via PDF extraction", len(html))
 
         df = parse_html(html)
-        logger.info(f"✓ Parsed to DataFrame with {len(df)} rows")
+        logger.info("✓ Parsed to DataFrame with %s rows", len(df))
 
         if len(df) > 0:
-            first_text = df.iloc[0]["text"][:80]
-            logger.info(f"  First row: {first_text}...")
+            first_text = df[0, "text"][:80]
+            logger.info("  First row: %s...", first_text)
             logger.info("✓ PDF extraction successfully extracts document content!")
         else:
             logger.warning("⚠ DataFrame is empty")
 
     except ImportError as e:
-        logger.warning(f"✗ Dependencies not installed: {e}")
+        logger.warning("✗ Dependencies not installed: %s", e)
     except Exception as e:
-        logger.error(f"✗ Error: {e}")
+        logger.error("✗ Error: %s", e)
 
 
 def test_sparql_direct() -> None:
@@ -197,19 +230,19 @@ def test_sparql_direct() -> None:
         # Test guess_celex_ids_via_eurlex
         logger.info("Testing guess_celex_ids_via_eurlex('2019/947')...")
         celex_ids = guess_celex_ids_via_eurlex("2019/947")
-        logger.info(f"✓ Found CELEX IDs: {celex_ids}")
+        logger.info("✓ Found CELEX IDs: %s", celex_ids)
 
         # Test get_documents
         logger.info("Testing get_documents(types=['REG'], limit=3)...")
         docs = get_documents(types=["REG"], limit=3)
-        logger.info(f"✓ Found {len(docs)} documents:")
+        logger.info("✓ Found %s documents:", len(docs))
         for doc in docs:
-            logger.info(f"  - {doc['celex']}: {doc['type']} ({doc['date']})")
+            logger.info("  - %s: %s (%s)", doc["celex"], doc["type"], doc["date"])
 
     except ImportError:
         logger.warning("✗ SPARQL dependencies not installed. Run: pip install eurlxp[sparql]")
     except Exception as e:
-        logger.error(f"✗ SPARQL error: {e}")
+        logger.error("✗ SPARQL error: %s", e)
 
 
 def main() -> int:
@@ -218,12 +251,30 @@ def main() -> int:
     logger.info("Testing library behavior with EUR-Lex bot detection")
     logger.info("")
 
-    test_with_sparql_fallback()
-    test_without_sparql_fallback()
-    test_sparql_fallback_fetches_real_content()
-    test_parser_different_formats()
-    test_pdf_extraction()
-    test_sparql_direct()
+    from eurlxp import ClientConfig, EURLexClient
+
+    # One session for all HTML fetches: keep-alive and any WAF cookies carry over
+    with EURLexClient(config=ClientConfig(sparql_fallback=True)) as client:
+
+        def shared_client_tests() -> None:
+            # EURLexClient isn't thread-safe (lazy connection setup, request_delay bookkeeping),
+            # so the tests sharing it run one after the other in a single thread
+            test_with_sparql_fallback(client)
+            test_parser_different_formats(client)
+
+        tests: list[Callable[[], None]] = [
+            shared_client_tests,
+            test_without_sparql_fallback,
+            test_sparql_fallback_fetches_real_content,
+            test_pdf_extraction,
+            test_sparql_direct,
+        ]
+        # Apart from the shared-client pair the tests are independent and network-bound, so run them at once
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(_run_captured, test) for test in tests]
+            for future in futures:
+                for record in future.result():
+                    logger.handle(record)
 
     logger.info("")
     logger.info("=" * 60)
@@ -50,20 +50,35 @@ from eurlxp.parser import (
     parse_article_paragraphs,
     parse_celex_id,
     parse_html,
+    parse_tree,
     process_paragraphs,
 )
 from eurlxp.sparql import (
     DateType,
     DocumentReference,
+    QueryCacheInfo,
     SPARQLServiceError,
+    arun_queries,
+    arun_query,
+    clear_query_cache,
     convert_sparql_output_to_dataframe,
+    disable_disk_cache,
+    enable_disk_cache,
     get_celex_dataframe,
+    get_celex_dataframes,
     get_documents,
     get_ids_and_urls_via_date,
     get_regulations,
     guess_celex_ids_via_eurlex,
+    guess_celex_ids_via_eurlex_bulk,
+    iter_documents,
+    iter_regulations,
     lookup_cellar_url,
+    lookup_cellar_urls,
+    query_cache_info,
+    run_queries,
     run_query,
+    run_query_csv,
 )
 
 __version__ = version("eurlxp")
@@ -91,6 +106,7 @@ __all__ = [
     "WAFChallengeError",
     # Parser
     "parse_html",
+    "parse_tree",
     "parse_article_paragraphs",
     "get_celex_id",
     "get_possible_celex_ids",
@@ -99,16 +115,30 @@ __all__ = [
     "process_paragraphs",
     # SPARQL
     "run_query",
+    "run_queries",
+    "run_query_csv",
+    "arun_query",
+    "arun_queries",
+    "clear_query_cache",
+    "query_cache_info",
+    "enable_disk_cache",
+    "disable_disk_cache",
     "convert_sparql_output_to_dataframe",
     "get_celex_dataframe",
+    "get_celex_dataframes",
     "guess_celex_ids_via_eurlex",
+    "guess_celex_ids_via_eurlex_bulk",
     "get_regulations",
+    "iter_regulations",
     "get_documents",
+    "iter_documents",
     "get_ids_and_urls_via_date",
     "lookup_cellar_url",
+    "lookup_cellar_urls",
     "DocumentReference",
     "DateType",
     "SPARQLServiceError",
+    "QueryCacheInfo",
     # Models
     "DocumentType",
     "SectorId",
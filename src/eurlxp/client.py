@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 import logging
+import re
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     import rdflib
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 
 import httpx
 
 from eurlxp.models import EURLEX_PREFIXES
+from eurlxp.parser import is_valid_celex_id
 
 logger = logging.getLogger(__name__)
 
@@ -33,16 +38,19 @@ class WAFChallengeError(Exception):
         super().__init__(message)
 
 
+# Substrings that only appear in AWS WAF challenge pages
+_WAF_INDICATORS = (
+    "awswaf.com",
+    "AwsWafIntegration",
+    "challenge.js",
+    "JavaScript is disabled",
+    "verify that you're not a robot",
+)
+
+
 def _is_waf_challenge(html: str) -> bool:
     """Check if the response is an AWS WAF JavaScript challenge."""
-    waf_indicators = [
-        "awswaf.com",
-        "AwsWafIntegration",
-        "challenge.js",
-        "JavaScript is disabled",
-        "verify that you're not a robot",
-    ]
-    return any(indicator in html for indicator in waf_indicators)
+    return any(indicator in html for indicator in _WAF_INDICATORS)
 
 
 def _http_get_with_retry(
@@ -416,15 +424,19 @@ DEFAULT_RETRY_BACKOFF = 2.0  # exponential backoff multiplier
 RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
 
 
-@dataclass
+@dataclass(frozen=True)
 class ClientConfig:
     """Configuration for EUR-Lex HTTP clients.
 
+    Instances are immutable and hashable, so one config can be shared across
+    clients. Custom ``headers`` are stored as a sorted tuple of
+    ``(name, value)`` pairs for that reason.
+
     Attributes
     ----------
     timeout : float
         Request timeout in seconds (default: 30.0).
-    headers : dict[str, str] | None
+    headers : Mapping[str, str] | None
         Custom headers to merge with defaults. Set to empty dict to use only defaults.
     request_delay : float
         Delay between requests in seconds for rate limiting (default: 0.0).
@@ -459,7 +471,7 @@ class ClientConfig:
     """
 
     timeout: float = DEFAULT_TIMEOUT
-    headers: dict[str, str] | None = None
+    headers: Mapping[str, str] | tuple[tuple[str, str], ...] | None = None
     request_delay: float = DEFAULT_REQUEST_DELAY
     use_browser_headers: bool = True
     referer: str | None = None
@@ -469,6 +481,10 @@ class ClientConfig:
     retry_delay: float = DEFAULT_RETRY_DELAY
     retry_backoff: float = DEFAULT_RETRY_BACKOFF
 
+    def __post_init__(self) -> None:
+        if self.headers is not None:
+            object.__setattr__(self, "headers", tuple(sorted(dict(self.headers).items())))
+
     def get_headers(self) -> dict[str, str]:
         """Build the final headers dict."""
         base = DEFAULT_HEADERS.copy() if self.use_browser_headers else MINIMAL_HEADERS.copy()
@@ -1100,22 +1116,25 @@ def get_html_by_cellar_id(cellar_id: str, language: str = "en") -> str:
         return client.get_html_by_cellar_id(cellar_id, language)
 
 
+# OJ reference: one or more letters, slash, 4 digits (year), slash, digits (number)
+_OJ_REFERENCE_RE = re.compile(r"^[A-Z]+/\d{4}/\d+$")
+
+
 def _is_oj_reference(identifier: str) -> bool:
     """Check if identifier is an Official Journal reference.
 
     OJ references follow the pattern: [series]/[year]/[number]
     Examples: C/2024/03709, L/2024/01234, CA/2024/00001
     """
-    import re
-
-    # Pattern: one or more letters, slash, 4 digits (year), slash, digits (number)
-    pattern = r"^[A-Z]+/\d{4}/\d+$"
-    return bool(re.match(pattern, identifier))
+    return bool(_OJ_REFERENCE_RE.match(identifier))
 
 
+@lru_cache(maxsize=4096)
 def detect_id_type(identifier: str) -> str:
     """Detect the type of EUR-Lex document identifier.
 
+    Results are memoized, since batch fetches often see the same identifiers repeatedly.
+
     Parameters
     ----------
     identifier : str
@@ -1137,9 +1156,6 @@ def detect_id_type(identifier: str) -> str:
     >>> detect_id_type("C/2026/00064")
     'oj_reference'
     """
-    # Import here to avoid circular imports
-    from eurlxp.parser import is_valid_celex_id
-
     # Cellar URL (full URL)
     if identifier.startswith("http://") or identifier.startswith("https://"):
         if "cellar" in identifier or "publications.europa.eu" in identifier:
@@ -1327,6 +1343,10 @@ def fetch_documents(
     return results
 
 
+# The prefix declarations never change, so build them once
+_PREFIX_BLOCK = "\n".join(f"prefix {prefix}: <{url}>" for prefix, url in EURLEX_PREFIXES.items()) + " "
+
+
 def prepend_prefixes(query: str) -> str:
     """Prepend SPARQL query with EUR-Lex prefixes.
 
@@ -1345,8 +1365,12 @@ def prepend_prefixes(query: str) -> str:
     >>> 'prefix rdf' in prepend_prefixes("SELECT ?name WHERE { ?person rdf:name ?name }")
     True
     """
-    prefix_lines = [f"prefix {prefix}: <{url}>" for prefix, url in EURLEX_PREFIXES.items()]
-    return "\n".join(prefix_lines) + " " + query
+    return _PREFIX_BLOCK + query
+
+
+# All known namespace IRIs in one anchored alternation, longest first so the most specific wins
+_PREFIX_BY_NAMESPACE = {url: prefix for prefix, url in EURLEX_PREFIXES.items()}
+_NAMESPACE_RE = re.compile("|".join(re.escape(url) for url in sorted(_PREFIX_BY_NAMESPACE, key=len, reverse=True)))
 
 
 def simplify_iri(iri: str) -> str:
@@ -1369,7 +1393,7 @@ def simplify_iri(iri: str) -> str:
     >>> simplify_iri("cdm:test")
     'cdm:test'
     """
-    for prefix, url in EURLEX_PREFIXES.items():
-        if iri.startswith(url):
-            return f"{prefix}:{iri[len(url) :]}"
-    return iri
+    match = _NAMESPACE_RE.match(iri)
+    if match is None:
+        return iri
+    return f"{_PREFIX_BY_NAMESPACE[match.group()]}:{iri[match.end() :]}"
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 import polars as pl
 
@@ -13,9 +15,34 @@ from eurlxp.models import ParseContext, ParseResult
 if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
+    from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
+
 # XML namespaces used in EUR-Lex documents
 XHTML_NAMESPACE = {"html": "http://www.w3.org/1999/xhtml"}
 
+# CELEX format: [Sector][Year (4 digits)][Type (1-3 chars)][Number (2-5 digits)][Optional suffix]
+# Written with plain character classes so the same pattern works in SPARQL regex() filters.
+CELEX_ID_PATTERN = "([0-9CE])([0-9]{4})([A-Z]{1,3})([0-9]{2,5})(.*)"
+_CELEX_ID_RE = re.compile(f"^{CELEX_ID_PATTERN}$")
+
+# Paragraph numbering: "1." in OJ text, "(1)" or "1)" in other layouts
+_NUMBERED_PARAGRAPH_RE = re.compile(r"^([0-9]+)[.]")
+_PARAGRAPH_PREFIX_RE = re.compile(r"^[(]?([0-9]+)[).]?\s*")
+_ARTICLE_PARAGRAPH_RE = re.compile(r"^(?:[0-9]+[.]|[(][0-9]+[)])")
+
+# Context columns of the parse_html() DataFrame, in ParseContext.to_dict() order
+_CONTEXT_COLUMNS = ("document", "article", "paragraph", "group", "section")
+_COLUMN_DTYPES = {"ref": pl.List(pl.String)}
+
+# CSS classes of <p> elements across the OJ, consolidated and Commission proposal layouts
+_DOC_TITLE_CLASSES = frozenset({"doc-ti", "oj-doc-ti", "Titreobjet", "Typedudocument"})
+_ARTICLE_TITLE_CLASSES = frozenset({"ti-art", "oj-ti-art", "Titrearticle"})
+_TEXT_CLASSES = frozenset({"normal", "oj-normal", "Normal"})
+
+# Candidates tried by get_possible_celex_ids() when no sector or document type is given
+_SECTOR_IDS = (*(str(i) for i in range(10)), "C", "E")
+_DOCUMENT_TYPES = ("L", "R", "D", "PC", "DC", "SC", "JC", "CJ", "CC", "CO")
+
 
 def _get_tag_name(raw_tag_name: str) -> str:
     """Extract tag name from potentially namespaced tag.
@@ -106,10 +133,10 @@ def _parse_span(element: Element, ref: list[str], context: ParseContext) -> list
 
     # Normal text classes: OJ format (normal) and Commission format (Normal - capital N)
     elif normalized_class in ("normal", "Normal"):
-        match = re.match(r"^([0-9]+)[.]", text)
+        match = _NUMBERED_PARAGRAPH_RE.match(text)
         if match:
-            context.paragraph = text.split(".")[0]
-            text = ".".join(text.split(".")[1:]).strip()
+            context.paragraph = match.group(1)
+            text = text[match.end() :].strip()
         results.append(ParseResult(text=text, item_type="text", ref=ref.copy(), context=context.copy()))
 
     else:
@@ -188,19 +215,62 @@ def parse_html(html: str) -> pl.DataFrame:
     # Use BeautifulSoup for robust parsing of all EUR-Lex formats
     # (OJ format, Commission proposals, etc.)
     results = _parse_html_with_beautifulsoup(html)
+    return _results_to_dataframe(results)
 
-    records = [r.to_dict() for r in results]
 
-    if not records:
-        return pl.DataFrame()
+def parse_tree(tree: etree._Element | etree._ElementTree) -> pl.DataFrame:
+    """Parse an already-parsed lxml tree of a EUR-Lex document into a Polars DataFrame.
+
+    Useful when the document has been parsed with lxml for other purposes,
+    so the HTML doesn't have to be parsed a second time.
+
+    Parameters
+    ----------
+    tree : lxml.etree._Element | lxml.etree._ElementTree
+        The parsed document. Both namespaced XHTML and plain HTML trees are supported.
+
+    Returns
+    -------
+    pl.DataFrame
+        DataFrame with the same columns as :func:`parse_html`.
+
+    Examples
+    --------
+    >>> from lxml import etree
+    >>> tree = etree.fromstring(b'<html><body><p class="normal">Text</p></body></html>')
+    >>> df = parse_tree(tree)
+    >>> df.columns
+    ['text', 'type', 'ref', 'document', 'article', 'paragraph', 'group', 'section']
+    >>> df.row(0)
+    ('Text', 'text', [], None, None, None, None, None)
+    """
+    paragraphs = [((p.get("class") or "").split(), "".join(s.strip() for s in p.itertext())) for p in tree.iter("{*}p")]
+    return _results_to_dataframe(_parse_paragraphs(paragraphs))
+
+
+def _results_to_dataframe(results: list[ParseResult]) -> pl.DataFrame:
+    """Build the text-only DataFrame returned by the public parse functions.
 
-    df = pl.DataFrame(records)
+    Columns are filled directly from the text results with a fixed schema,
+    instead of building and then filtering a dict per parsed element.
+    """
+    if not results:
+        return pl.DataFrame()
 
     # Filter to only text items (matching original behavior)
-    if "type" in df.columns:
-        df = df.filter(pl.col("type") == "text")
+    texts = [r for r in results if r.item_type == "text"]
 
-    return df
+    columns: dict[str, list[Any]] = {
+        "text": [r.text for r in texts],
+        "type": [r.item_type for r in texts],
+        "ref": [r.ref for r in texts],
+    }
+    if any(r.modifier for r in texts):
+        columns["modifier"] = [r.modifier for r in texts]
+    for name in _CONTEXT_COLUMNS:
+        columns[name] = [getattr(r.context, name) for r in texts]
+
+    return pl.DataFrame(columns, schema={name: _COLUMN_DTYPES.get(name, pl.String) for name in columns})
 
 
 def _parse_html_with_beautifulsoup(html: str) -> list[ParseResult]:
@@ -208,77 +278,85 @@ def _parse_html_with_beautifulsoup(html: str) -> list[ParseResult]:
 
     Tries lxml-xml parser first (for XHTML documents), then falls back to
     lxml HTML parser for older HTML documents.
-
-    Processes all <p> tags in a single pass in document order so that
-    article, group, and section context updates apply only to subsequent rows.
     """
     from bs4 import BeautifulSoup
 
     # Try lxml-xml parser first (for XHTML documents)
     soup = BeautifulSoup(html, "lxml-xml")
+    p_tags = soup.find_all("p")
 
     # If no <p> tags found, try lxml HTML parser (for older HTML documents)
-    if not soup.find_all("p"):
+    if not p_tags:
         soup = BeautifulSoup(html, "lxml")
+        p_tags = soup.find_all("p")
 
-    results: list[ParseResult] = []
-    context = ParseContext()
-
-    doc_title_classes = {"doc-ti", "oj-doc-ti", "Titreobjet", "Typedudocument"}
-    article_title_classes = {"ti-art", "oj-ti-art", "Titrearticle"}
-    text_classes = {"normal", "oj-normal", "Normal"}
-
-    # Single pass through all <p> tags in document order
-    for p_tag in soup.find_all("p"):
+    paragraphs = []
+    for p_tag in p_tags:
         css_classes = p_tag.get("class") or []
         if isinstance(css_classes, str):
             css_classes = [css_classes]
-        css_class_str = " ".join(css_classes)
-        css_class_set = set(css_classes)
+        paragraphs.append((css_classes, p_tag.get_text(strip=True)))
+
+    return _parse_paragraphs(paragraphs)
 
-        text = p_tag.get_text(strip=True)
+
+def _parse_paragraphs(paragraphs: Sequence[tuple[Sequence[str], str]]) -> list[ParseResult]:
+    """Classify ``(css_classes, text)`` pairs of <p> elements into parse results.
+
+    Processes all paragraphs in a single pass in document order so that
+    article, group, and section context updates apply only to subsequent rows.
+    """
+    results: list[ParseResult] = []
+    context = ParseContext()
+
+    # Single pass through all <p> tags in document order
+    for css_classes, text in paragraphs:
         if not text:
             continue
 
+        css_class_set = set(css_classes)
+        css_class_str = " ".join(css_classes)
+        # Cheap pre-filter so plain text paragraphs skip the title-prefix scans below
+        has_title_prefix = "ti-" in css_class_str
+
         # Document title
-        if css_class_set & doc_title_classes:
+        if css_class_set & _DOC_TITLE_CLASSES:
             if context.document is None:
                 context.document = ""
             context.document += text
             results.append(ParseResult(text=text, item_type="doc-title", ref=[], context=context.copy()))
 
         # Article title
-        elif css_class_set & article_title_classes:
+        elif css_class_set & _ARTICLE_TITLE_CLASSES:
             context.article = text.replace("Article", "").strip()
             context.paragraph = None
             results.append(ParseResult(text=text, item_type="art-title", ref=[], context=context.copy()))
 
         # Group title (ti-grseq-* or oj-ti-grseq-* classes)
-        elif "ti-grseq-" in css_class_str or "oj-ti-grseq-" in css_class_str:
+        elif has_title_prefix and "ti-grseq-" in css_class_str:
             context.group = text
             results.append(ParseResult(text=text, item_type="group-title", ref=[], context=context.copy()))
 
         # Section title (ti-section-* or oj-ti-section-* classes)
-        elif "ti-section-" in css_class_str or "oj-ti-section-" in css_class_str:
+        elif has_title_prefix and "ti-section-" in css_class_str:
             context.section = text
             results.append(ParseResult(text=text, item_type="section-title", ref=[], context=context.copy()))
 
         # Normal text paragraphs
-        elif css_class_set & text_classes:
+        elif css_class_set & _TEXT_CLASSES:
             # Check for numbered paragraphs
-            match = re.match(r"^[(]?([0-9]+)[).]?", text)
+            match = _PARAGRAPH_PREFIX_RE.match(text)
             if match:
                 context.paragraph = match.group(1)
                 # Remove the number prefix
-                text = re.sub(r"^[(]?[0-9]+[).]?\s*", "", text)
+                text = text[match.end() :]
             results.append(ParseResult(text=text, item_type="text", ref=[], context=context.copy()))
 
     # Fallback: if no text results found, extract text from all <p> tags
     # This handles unknown EUR-Lex formats that use different CSS classes
     text_results = [r for r in results if r.item_type == "text"]
     if not text_results:
-        for p_tag in soup.find_all("p"):
-            text = p_tag.get_text(strip=True)
+        for _, text in paragraphs:
             # Skip short text, HTML fragments, and navigation elements
             if (
                 text
@@ -317,17 +395,11 @@ def parse_article_paragraphs(article: str) -> dict[str | None, str]:
     article = article.replace("     ", "\n")
 
     for line in article.split("\n"):
-        # Check for numbered paragraph (e.g., "1.")
-        match = re.match(r"^([0-9]+)[.]", line)
+        # Check for numbered (e.g., "1.") or parenthesized (e.g., "(1)") paragraph
+        match = _ARTICLE_PARAGRAPH_RE.match(line)
         if match:
             paragraph = match.group(0)
-            line = ".".join(line.split(".")[1:]).strip()
-        else:
-            # Check for parenthesized paragraph (e.g., "(1)")
-            match = re.match(r"^[(]([0-9]+)[)]", line)
-            if match:
-                paragraph = match.group(0)
-                line = ")".join(line.split(")")[1:]).strip()
+            line = line[match.end() :].strip()
 
         if paragraph not in paragraphs:
             paragraphs[paragraph] = []
@@ -339,6 +411,8 @@ def parse_article_paragraphs(article: str) -> dict[str | None, str]:
 def parse_celex_id(celex_id: str) -> dict[str, str | None] | None:
     """Parse a CELEX ID into its components.
 
+    Parsing is memoized; each call still returns a new dict.
+
     Parameters
     ----------
     celex_id : str
@@ -358,36 +432,45 @@ def parse_celex_id(celex_id: str) -> dict[str, str | None] | None:
     {'sector': '3', 'year': '2012', 'doc_type': 'L', 'number': '0029', 'suffix': 'R(06)'}
     >>> parse_celex_id('C/2026/00064')  # OJ reference, not CELEX
     """
-    if not celex_id:
+    parts = _parse_celex_id_parts(celex_id)
+    if parts is None:
+        return None
+
+    sector, year, doc_type, number, suffix = parts
+    return {
+        "sector": sector,
+        "year": year,
+        "doc_type": doc_type,
+        "number": number,
+        "suffix": suffix,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _parse_celex_id_parts(celex_id: str) -> tuple[str, str, str, str, str | None] | None:
+    """Split a CELEX ID into ``(sector, year, doc_type, number, suffix)``, or None if invalid."""
+    # Shortest form is sector + year + one-letter type + two-digit number, e.g. 32019R01
+    if not celex_id or len(celex_id) < 8:
         return None
 
     # OJ series references like C/2026/00064 are not CELEX IDs
     if "/" in celex_id:
         return None
 
-    # CELEX format: [Sector][Year (4 digits)][Type (1-2 chars)][Number (2-5 digits)][Optional suffix]
+    # Validate year is reasonable (1950-2100) before running the regex. Four
+    # digit strings compare like their numbers; the regex rejects non-digits.
+    if not "1950" <= celex_id[1:5] <= "2100":
+        return None
+
     # Sectors: 0-9, C, E
     # Example: 32019R0947, 52026XG00745, 32012L0029R(06)
-    pattern = r"^([0-9CE])(\d{4})([A-Z]{1,3})(\d{2,5})(.*)$"
-    match = re.match(pattern, celex_id)
+    match = _CELEX_ID_RE.match(celex_id)
 
     if not match:
         return None
 
     sector, year, doc_type, number, suffix = match.groups()
-
-    # Validate year is reasonable (1950-2100)
-    year_int = int(year)
-    if year_int < 1950 or year_int > 2100:
-        return None
-
-    return {
-        "sector": sector,
-        "year": year,
-        "doc_type": doc_type,
-        "number": number,
-        "suffix": suffix if suffix else None,
-    }
+    return sector, year, doc_type, number, suffix if suffix else None
 
 
 def is_valid_celex_id(celex_id: str) -> bool:
@@ -410,7 +493,7 @@ def is_valid_celex_id(celex_id: str) -> bool:
     >>> is_valid_celex_id('C/2026/00064')
     False
     """
-    return parse_celex_id(celex_id) is not None
+    return _parse_celex_id_parts(celex_id) is not None
 
 
 def get_celex_id(slash_notation: str, document_type: str = "R", sector_id: str = "3") -> str:
@@ -442,6 +525,12 @@ def get_celex_id(slash_notation: str, document_type: str = "R", sector_id: str =
     Handle cases where both are years - like 2025/1987, using the ruling that the first term is year
 
     """
+    year, document_id = _split_slash_notation(slash_notation)
+    return f"{sector_id}{year}{document_type}{document_id}"
+
+
+def _split_slash_notation(slash_notation: str) -> tuple[int, str]:
+    """Split a slash notation into its year and its zero-padded document number."""
     term1_str, term2_str = slash_notation.split("/")
     current_year = datetime.now().year
     term1, term2 = int(term1_str), int(term2_str)
@@ -455,7 +544,7 @@ def get_celex_id(slash_notation: str, document_type: str = "R", sector_id: str =
     elif term2_is_year and not term1_is_year:
         year, document_id = term2, term1
 
-    return f"{sector_id}{year}{document_type}{str(document_id).zfill(4)}"
+    return year, str(document_id).zfill(4)
 
 
 def get_possible_celex_ids(
@@ -488,16 +577,16 @@ def get_possible_celex_ids(
     --------
     Add D, to possible document types later removed E due to query character limit
     """
-    sector_ids = [str(i) for i in range(10)] + ["C", "E"] if sector_id is None else [str(sector_id)]
-    document_types = (
-        ["L", "R", "D", "PC", "DC", "SC", "JC", "CJ", "CC", "CO"] if document_type is None else [document_type]
-    )
+    sector_ids = _SECTOR_IDS if sector_id is None else (str(sector_id),)
+    document_types = _DOCUMENT_TYPES if document_type is None else (document_type,)
 
     # document_types = (
     #     ["L", "R", "E", "D", "PC", "DC", "SC", "SWD", "JC", "CJ", "CC", "CO"] if document_type is None else [document_type]
     # )
 
-    return [get_celex_id(slash_notation, dt, sid) for sid in sector_ids for dt in document_types]
+    # Parse the reference once; only the sector and type prefixes vary between candidates
+    year, document_id = _split_slash_notation(slash_notation)
+    return [f"{sid}{year}{dt}{document_id}" for sid in sector_ids for dt in document_types]
 
 
 def process_paragraphs(paragraphs: list[dict]) -> pl.DataFrame:
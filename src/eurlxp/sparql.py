@@ -9,21 +9,47 @@ way to query EUR-Lex data as it doesn't trigger bot detection like HTML scraping
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
+import io
+import json
 import logging
+import os
+import random
+import sqlite3
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from typing import TYPE_CHECKING
-
+from functools import lru_cache
+from importlib.metadata import version
+from importlib.util import find_spec
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
 import polars as pl
 
-from eurlxp.client import prepend_prefixes
+from eurlxp.client import EURLEX_SPARQL_URL, RETRYABLE_STATUS_CODES, prepend_prefixes
+from eurlxp.models import EURLEX_PREFIXES
+from eurlxp.parser import CELEX_ID_PATTERN, get_possible_celex_ids, is_valid_celex_id
 
 if TYPE_CHECKING:
-    pass
+    from collections.abc import Iterator
 
 logger = logging.getLogger(__name__)
 
+# orjson parses large SPARQL result payloads several times faster than the stdlib
+try:
+    from orjson import loads as _json_loads  # pyright: ignore[reportMissingImports]
+except ImportError:
+    _json_loads = json.loads
+
 
 class DateType(str, Enum):
     """Date field to use when querying documents.
@@ -49,6 +75,46 @@ class DateType(str, Enum):
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY = 2.0  # seconds
 DEFAULT_RETRY_BACKOFF = 2.0  # exponential backoff multiplier
+MAX_RETRY_DELAY = 60.0  # seconds; cap for backoff and server-requested Retry-After waits
+
+# 429 means the endpoint is throttling us; retry it like a transient server error
+_SPARQL_RETRYABLE_STATUS_CODES = RETRYABLE_STATUS_CODES | {429}
+
+# Async client defaults (arun_query / arun_queries); sync queries use it for everything but reads
+DEFAULT_SPARQL_TIMEOUT = 30.0  # seconds
+DEFAULT_MAX_CONCURRENCY = 4  # concurrent queries; higher values risk endpoint throttling
+
+# Read timeout for sync queries (run_query, run_query_csv, get_celex_dataframe, ...). None waits as long as
+# the endpoint takes, since unpaged queries can legitimately run for minutes; set seconds to bound them.
+SPARQL_READ_TIMEOUT: float | None = None
+
+# Sent with every SPARQL request so the endpoint operators can identify the client
+SPARQL_HEADERS = {"User-Agent": f"eurlxp/{version('eurlxp')} (https://github.com/morrieinmaas/eurlxp)"}
+
+# HTTP/2 lets concurrent queries share one connection; it needs the optional h2 package
+_HTTP2 = find_spec("h2") is not None
+
+# In-process cache for run_query results
+QUERY_CACHE_SIZE = 512  # maximum number of cached queries
+QUERY_CACHE_TTL = 1200.0  # seconds
+
+# Optional on-disk cache beneath the in-process one, shared across runs (see enable_disk_cache)
+_DEFAULT_DISK_CACHE_TTL = 86400.0  # seconds
+
+
+def _disk_cache_ttl_from_env() -> float:
+    """Read ``$EURLXP_CACHE_TTL``, falling back to the default if it is unset or not a number."""
+    value = os.environ.get("EURLXP_CACHE_TTL")
+    if value is None:
+        return _DEFAULT_DISK_CACHE_TTL
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Ignoring invalid EURLXP_CACHE_TTL %r; using %s seconds", value, _DEFAULT_DISK_CACHE_TTL)
+        return _DEFAULT_DISK_CACHE_TTL
+
+
+DISK_CACHE_TTL = _disk_cache_ttl_from_env()
 
 
 class SPARQLServiceError(Exception):
@@ -63,20 +129,275 @@ class SPARQLServiceError(Exception):
         self.status_code = status_code
 
 
+@lru_cache(maxsize=1)
 def _check_sparql_dependencies() -> None:
-    """Check if SPARQL dependencies are installed."""
+    """Check that rdflib, needed to parse RDF documents, is installed.
+
+    SPARQL queries themselves only need httpx. A successful check is cached; a failed one raises and is retried on the
+    next call, so installing the extra mid-session still works.
+    """
     try:
         import rdflib  # noqa: F401
-        from SPARQLWrapper import SPARQLWrapper  # noqa: F401
     except ImportError as e:
         raise ImportError("SPARQL dependencies not installed. Install with: pip install eurlxp[sparql]") from e
 
 
+_query_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_query_cache_lock = threading.Lock()  # guards _query_cache and the hit/miss counters
+_query_cache_hits = 0
+_query_cache_misses = 0
+# SQLite I/O can block for seconds on a busy database, so it has its own lock and never runs under _query_cache_lock
+_disk_cache_lock = threading.Lock()
+_disk_cache: sqlite3.Connection | None = None
+_disk_cache_ttl = DISK_CACHE_TTL
+
+
+def _query_cache_key(query: str) -> str:
+    """Hash a query, ignoring indentation and blank lines so equivalent queries collide."""
+    normalized = "\n".join(line.strip() for line in query.splitlines() if line.strip())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _query_cache_get(key: str) -> dict | None:
+    cached = _memory_cache_get(key)
+    if cached is not None:
+        return cached
+    return _disk_cache_lookup(key)
+
+
+def _query_cache_put(key: str, results: dict) -> None:
+    _memory_cache_put(key, results)
+    _disk_cache_put(key, results)
+
+
+def _memory_cache_get(key: str) -> dict | None:
+    global _query_cache_hits
+
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > QUERY_CACHE_TTL:
+            del _query_cache[key]
+            return None
+        _query_cache.move_to_end(key)
+        _query_cache_hits += 1
+    logger.debug("SPARQL query cache hit: %s", key)
+    # Copy so callers can't mutate the cached result
+    return copy.deepcopy(results)
+
+
+def _memory_cache_put(key: str, results: dict) -> None:
+    entry = (time.monotonic(), copy.deepcopy(results))
+    with _query_cache_lock:
+        _query_cache[key] = entry
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+
+
+def _disk_cache_lookup(key: str) -> dict | None:
+    """Finish a lookup the in-memory cache missed: consult the disk cache and count the outcome."""
+    global _query_cache_hits, _query_cache_misses
+
+    results = _disk_cache_get(key)
+    if results is None:
+        with _query_cache_lock:
+            _query_cache_misses += 1
+        logger.debug("SPARQL query cache miss: %s", key)
+        return None
+    _memory_cache_put(key, results)
+    with _query_cache_lock:
+        _query_cache_hits += 1
+    logger.debug("SPARQL query cache hit (disk): %s", key)
+    return results
+
+
+def _disk_cache_get(key: str) -> dict | None:
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            return None
+        try:
+            row = _disk_cache.execute("SELECT stored_at, results FROM sparql_results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[0] > _disk_cache_ttl:
+                _disk_cache.execute("DELETE FROM sparql_results WHERE key = ?", (key,))
+                _disk_cache.commit()
+                return None
+            return dict(_json_loads(row[1]))
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("Reading the SPARQL disk cache failed: %s", e)
+            return None
+
+
+def _disk_cache_put(key: str, results: dict) -> None:
+    if _disk_cache is None:
+        return
+    payload = json.dumps(results)
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            return
+        try:
+            _disk_cache.execute(
+                "INSERT OR REPLACE INTO sparql_results (key, stored_at, results) VALUES (?, ?, ?)",
+                (key, time.time(), payload),
+            )
+            _disk_cache.commit()
+        except sqlite3.Error as e:
+            logger.warning("Writing the SPARQL disk cache failed: %s", e)
+
+
+def enable_disk_cache(directory: str | os.PathLike[str] | None = None, ttl: float = DISK_CACHE_TTL) -> Path:
+    """Persist ``run_query`` and ``run_query_csv`` results in a SQLite database shared across processes.
+
+    Queries missing from the in-process cache are looked up on disk before the
+    endpoint is hit, so batch jobs that repeat the same lookups on every run
+    only pay for them once per ``ttl``. The cache is off unless this is called
+    or the ``EURLXP_CACHE_DIR`` environment variable is set at import time.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike | None
+        Directory for the cache database. Defaults to ``$EURLXP_CACHE_DIR``,
+        or ``~/.cache/eurlxp`` if that is unset.
+    ttl : float
+        Seconds a cached result stays valid (default: 86400, or ``$EURLXP_CACHE_TTL``).
+
+    Returns
+    -------
+    Path
+        Path of the cache database.
+
+    Examples
+    --------
+    >>> path = enable_disk_cache()  # doctest: +SKIP
+    >>> path = enable_disk_cache("/tmp/eurlxp-cache", ttl=3600)  # doctest: +SKIP
+    """
+    global _disk_cache, _disk_cache_ttl
+
+    cache_dir = Path(directory or os.environ.get("EURLXP_CACHE_DIR") or Path.home() / ".cache" / "eurlxp")
+    cache_dir = cache_dir.expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / "sparql.sqlite3"
+
+    connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS sparql_results (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, results TEXT NOT NULL)"
+    )
+    connection.commit()
+
+    with _disk_cache_lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+        _disk_cache = connection
+        _disk_cache_ttl = ttl
+    return path
+
+
+def disable_disk_cache() -> None:
+    """Stop using the on-disk query cache. Cached results stay on disk.
+
+    Examples
+    --------
+    >>> disable_disk_cache()
+    """
+    global _disk_cache
+
+    with _disk_cache_lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+            _disk_cache = None
+
+
+@dataclass
+class QueryCacheInfo:
+    """Statistics for the ``run_query`` result cache.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups served from the cache (in memory or on disk).
+    misses : int
+        Lookups that had to query the endpoint.
+    maxsize : int
+        Maximum number of results kept in memory.
+    currsize : int
+        Number of results currently kept in memory.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def query_cache_info() -> QueryCacheInfo:
+    """Report hit/miss statistics for the ``run_query`` result cache.
+
+    Counters are reset by ``clear_query_cache()``. Calls with ``use_cache=False``
+    are not counted.
+
+    Returns
+    -------
+    QueryCacheInfo
+        The current cache statistics.
+
+    Examples
+    --------
+    >>> info = query_cache_info()
+    >>> info.hits >= 0
+    True
+    """
+    with _query_cache_lock:
+        return QueryCacheInfo(_query_cache_hits, _query_cache_misses, QUERY_CACHE_SIZE, len(_query_cache))
+
+
+def clear_query_cache() -> None:
+    """Remove all cached ``run_query`` results, including those on disk, and reset the statistics.
+
+    Examples
+    --------
+    >>> clear_query_cache()
+    """
+    global _query_cache_hits, _query_cache_misses
+
+    with _query_cache_lock:
+        _query_cache.clear()
+        _query_cache_hits = _query_cache_misses = 0
+    with _disk_cache_lock:
+        if _disk_cache is not None:
+            try:
+                _disk_cache.execute("DELETE FROM sparql_results")
+                _disk_cache.commit()
+            except sqlite3.Error as e:
+                logger.warning("Clearing the SPARQL disk cache failed: %s", e)
+
+
+def _enable_disk_cache_from_env() -> None:
+    """Open the disk cache named by ``$EURLXP_CACHE_DIR``, if set.
+
+    Runs at import time, so a cache directory that can't be created or opened
+    is logged and skipped rather than making ``eurlxp`` unimportable.
+    """
+    if not os.environ.get("EURLXP_CACHE_DIR"):
+        return
+    try:
+        enable_disk_cache()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Could not open the SPARQL disk cache in EURLXP_CACHE_DIR: %s", e)
+
+
+_enable_disk_cache_from_env()
+
+
 def run_query(
     query: str,
     max_retries: int = DEFAULT_MAX_RETRIES,
     retry_delay: float = DEFAULT_RETRY_DELAY,
     retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    use_cache: bool = True,
 ) -> dict:
     """Run a SPARQL query on EUR-Lex with automatic retry on failure.
 
@@ -90,6 +411,11 @@ def run_query(
         Initial delay between retries in seconds (default: 2.0).
     retry_backoff : float
         Exponential backoff multiplier (default: 2.0).
+    use_cache : bool
+        If True (default), serve repeated identical queries from an in-process
+        LRU cache (up to 512 queries, each kept for 20 minutes), and from the
+        on-disk cache if ``enable_disk_cache()`` is active. Only successful
+        results are cached. Use ``clear_query_cache()`` to empty it.
 
     Returns
     -------
@@ -105,50 +431,429 @@ def run_query(
     --------
     >>> results = run_query("SELECT ?s WHERE { ?s ?p ?o } LIMIT 1")  # doctest: +SKIP
     >>> results = run_query(query, max_retries=5, retry_delay=3.0)  # More retries
+    >>> results = run_query(query, use_cache=False)  # Always hit the endpoint
     """
-    _check_sparql_dependencies()
-    from urllib.error import HTTPError
+    if not use_cache:
+        return _execute_query(query, max_retries, retry_delay, retry_backoff)
+
+    key = _query_cache_key(query)
+    cached = _query_cache_get(key)
+    if cached is not None:
+        return cached
+
+    results = _execute_query(query, max_retries, retry_delay, retry_backoff)
+    _query_cache_put(key, results)
+    return results
+
+
+def run_queries(
+    queries: list[str],
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    **kwargs: Any,
+) -> list[dict]:
+    """Run several SPARQL queries concurrently from synchronous code.
+
+    The queries are spread over a thread pool and share the pooled keep-alive
+    connections of :func:`run_query`, so N independent queries take roughly as
+    long as the slowest one. Use :func:`arun_queries` from async code.
+
+    Parameters
+    ----------
+    queries : list[str]
+        The SPARQL queries to run.
+    max_workers : int
+        Maximum number of queries in flight at once (default: 4). Keep this low
+        to avoid being throttled by the endpoint.
+    **kwargs
+        Passed to :func:`run_query` (``max_retries``, ``use_cache``, ...).
+
+    Returns
+    -------
+    list[dict]
+        The results, in the same order as ``queries``.
+
+    Raises
+    ------
+    SPARQLServiceError
+        If any query fails after all retries.
+
+    Examples
+    --------
+    >>> results = run_queries([query_a, query_b, query_c])  # doctest: +SKIP
+    """
+    if len(queries) <= 1:
+        return [run_query(query, **kwargs) for query in queries]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+        return list(executor.map(lambda query: run_query(query, **kwargs), queries))
 
-    from SPARQLWrapper import JSON, SPARQLWrapper
-    from SPARQLWrapper.SPARQLExceptions import EndPointInternalError, EndPointNotFound, QueryBadFormed
 
-    sparql = SPARQLWrapper("https://publications.europa.eu/webapi/rdf/sparql")
-    sparql.setQuery(query)
-    sparql.setReturnFormat(JSON)
+# Shared by every run_query call, so connections to the endpoint are kept alive between queries
+_sparql_client: httpx.Client | None = None
+_sparql_client_lock = threading.Lock()
+
+SPARQL_JSON_RESULTS = "application/sparql-results+json"
+SPARQL_CSV_RESULTS = "text/csv"
+
+
+def _sync_timeout() -> httpx.Timeout:
+    """Timeout for a sync request, read from ``SPARQL_READ_TIMEOUT`` at call time."""
+    return httpx.Timeout(DEFAULT_SPARQL_TIMEOUT, read=SPARQL_READ_TIMEOUT)
+
+
+def _get_sparql_client() -> httpx.Client:
+    """Return the pooled client for the SPARQL endpoint, creating it on first use."""
+    global _sparql_client
+
+    with _sparql_client_lock:
+        if _sparql_client is None:
+            _sparql_client = httpx.Client(
+                headers=SPARQL_HEADERS,
+                http2=_HTTP2,
+                timeout=_sync_timeout(),
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=DEFAULT_MAX_CONCURRENCY),
+            )
+        return _sparql_client
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
 
+
+def _retry_wait(current_delay: float, status_code: int | None, retry_after: str | None) -> float:
+    """Seconds to wait before retrying a failed query.
+
+    A ``Retry-After`` from the server wins. Otherwise the wait is drawn with full
+    jitter from ``[0, current_delay]`` so that parallel clients don't retry in
+    lockstep; rate-limited (429) requests always wait at least ``current_delay``.
+    """
+    wait = _parse_retry_after(retry_after)
+    if wait is None:
+        jitter = random.uniform(0, current_delay)
+        wait = current_delay + jitter if status_code == 429 else jitter
+    return min(wait, MAX_RETRY_DELAY)
+
+
+def _execute_query(query: str, max_retries: int, retry_delay: float, retry_backoff: float) -> dict:
+    """Send a query to the SPARQL endpoint, retrying transient failures."""
+    body = _send_query(query, SPARQL_JSON_RESULTS, max_retries, retry_delay, retry_backoff)
+    return dict(_json_loads(body))
+
+
+def _send_query(query: str, accept: str, max_retries: int, retry_delay: float, retry_backoff: float) -> bytes:
+    """POST a query over the pooled client and return the raw response body."""
+    client = _get_sparql_client()
     last_error: Exception | None = None
+    status_code: int | None = None
+    retry_after: str | None = None
     current_delay = retry_delay
 
     for attempt in range(max_retries + 1):
         try:
-            results = sparql.query().convert()
-            return dict(results)  # type: ignore[arg-type]
-        except (HTTPError, EndPointInternalError) as e:
+            response = client.post(
+                EURLEX_SPARQL_URL, data={"query": query}, headers={"Accept": accept}, timeout=_sync_timeout()
+            )
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            if status_code not in _SPARQL_RETRYABLE_STATUS_CODES:
+                raise SPARQLServiceError(f"SPARQL query error: {e}", status_code=status_code) from e
+            retry_after = e.response.headers.get("Retry-After")
+            last_error = e
+        except httpx.TransportError as e:
+            status_code = None
+            retry_after = None
             last_error = e
-            status_code = getattr(e, "code", None) or getattr(e, "status_code", None)
-
-            if attempt < max_retries:
-                logger.warning(
-                    "SPARQL query failed (attempt %d/%d, status=%s): %s. Retrying in %.1fs...",
-                    attempt + 1,
-                    max_retries + 1,
-                    status_code,
-                    str(e)[:100],
-                    current_delay,
-                )
-                time.sleep(current_delay)
-                current_delay *= retry_backoff
-            else:
-                logger.error("SPARQL query failed after %d attempts: %s", max_retries + 1, e)
-        except (QueryBadFormed, EndPointNotFound) as e:
-            raise SPARQLServiceError(f"SPARQL query error: {e}") from e
+
+        if attempt < max_retries:
+            wait = _retry_wait(current_delay, status_code, retry_after)
+            logger.warning(
+                "SPARQL query failed (attempt %d/%d, status=%s): %s. Retrying in %.1fs...",
+                attempt + 1,
+                max_retries + 1,
+                status_code,
+                str(last_error)[:100],
+                wait,
+            )
+            time.sleep(wait)
+            current_delay = min(current_delay * retry_backoff, MAX_RETRY_DELAY)
+        else:
+            logger.error("SPARQL query failed after %d attempts: %s", max_retries + 1, last_error)
 
     raise SPARQLServiceError(
         f"SPARQL endpoint unavailable after {max_retries + 1} attempts. Last error: {last_error}",
-        status_code=getattr(last_error, "code", None),
+        status_code=status_code,
+    )
+
+
+def run_query_csv(
+    query: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    use_cache: bool = True,
+) -> pl.DataFrame:
+    """Run a SPARQL query on EUR-Lex and return the results as a DataFrame.
+
+    The results are requested as CSV and parsed by polars directly, which is
+    much cheaper than ``convert_sparql_output_to_dataframe(run_query(...))``
+    for large tabular results. CSV results carry no datatype or language
+    metadata and cannot tell unbound variables from empty literals (both are
+    null); use ``run_query`` when you need either.
+
+    Parameters
+    ----------
+    query : str
+        The SPARQL query to run.
+    max_retries : int
+        Maximum number of retry attempts (default: 3).
+    retry_delay : float
+        Initial delay between retries in seconds (default: 2.0).
+    retry_backoff : float
+        Exponential backoff multiplier (default: 2.0).
+    use_cache : bool
+        If True (default), share ``run_query``'s in-process and on-disk caches.
+        CSV and JSON results of the same query are cached separately.
+
+    Returns
+    -------
+    pl.DataFrame
+        One string column per selected variable, with known IRI prefixes
+        simplified as in ``convert_sparql_output_to_dataframe``.
+
+    Raises
+    ------
+    SPARQLServiceError
+        If the query fails after all retries.
+
+    Examples
+    --------
+    >>> df = run_query_csv("SELECT ?s ?p WHERE { ?s ?p ?o } LIMIT 10")  # doctest: +SKIP
+    """
+    body = _send_csv_query(query, max_retries, retry_delay, retry_backoff, use_cache)
+    if not body.strip():
+        return pl.DataFrame()
+
+    df = pl.read_csv(io.BytesIO(body), infer_schema_length=0)
+    return df.with_columns(_simplify_iri_expr(column) for column in df.columns)
+
+
+def _send_csv_query(query: str, max_retries: int, retry_delay: float, retry_backoff: float, use_cache: bool) -> bytes:
+    """Fetch CSV results for a query through the query cache."""
+    if not use_cache:
+        return _send_query(query, SPARQL_CSV_RESULTS, max_retries, retry_delay, retry_backoff)
+
+    # The cache stores JSON-compatible dicts, so the CSV text is wrapped in one
+    key = _query_cache_key(f"{SPARQL_CSV_RESULTS}\n{query}")
+    cached = _query_cache_get(key)
+    if cached is not None:
+        return cached["csv"].encode()
+
+    body = _send_query(query, SPARQL_CSV_RESULTS, max_retries, retry_delay, retry_backoff)
+    _query_cache_put(key, {"csv": body.decode()})
+    return body
+
+
+def _simplify_iri_expr(name: str) -> pl.Expr:
+    """Vectorized ``simplify_iri`` for a string column.
+
+    Namespaces are tried longest first, like ``simplify_iri``, so the most
+    specific prefix wins when one namespace IRI extends another.
+    """
+    column = pl.col(name)
+    prefixes = sorted(EURLEX_PREFIXES.items(), key=lambda item: len(item[1]), reverse=True)
+    prefix, url = prefixes[0]
+    expr = pl.when(column.str.starts_with(url)).then(pl.lit(f"{prefix}:") + column.str.slice(len(url)))
+    for prefix, url in prefixes[1:]:
+        expr = expr.when(column.str.starts_with(url)).then(pl.lit(f"{prefix}:") + column.str.slice(len(url)))
+    return expr.otherwise(column).alias(name)
+
+
+def _async_sparql_client(max_connections: int = DEFAULT_MAX_CONCURRENCY) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=SPARQL_HEADERS,
+        http2=_HTTP2,
+        timeout=DEFAULT_SPARQL_TIMEOUT,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
     )
 
 
+async def arun_query(
+    query: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    use_cache: bool = True,
+    client: httpx.AsyncClient | None = None,
+) -> dict:
+    """Run a SPARQL query on EUR-Lex asynchronously, with automatic retry on failure.
+
+    The async counterpart of :func:`run_query`. It POSTs the query with
+    ``httpx.AsyncClient`` and shares the same result cache.
+
+    Parameters
+    ----------
+    query : str
+        The SPARQL query to run.
+    max_retries : int
+        Maximum number of retry attempts (default: 3).
+    retry_delay : float
+        Initial delay between retries in seconds (default: 2.0).
+    retry_backoff : float
+        Exponential backoff multiplier (default: 2.0).
+    use_cache : bool
+        If True (default), serve repeated identical queries from the in-process cache.
+    client : httpx.AsyncClient | None
+        Client to send the request with, e.g. to reuse pooled connections across
+        queries. A temporary client is created if None.
+
+    Returns
+    -------
+    dict
+        A dictionary containing the results.
+
+    Raises
+    ------
+    SPARQLServiceError
+        If the query is rejected or fails after all retries.
+
+    Examples
+    --------
+    >>> results = await arun_query("SELECT ?s WHERE { ?s ?p ?o } LIMIT 1")  # doctest: +SKIP
+    """
+    key = _query_cache_key(query)
+    if use_cache:
+        cached = _memory_cache_get(key)
+        if cached is None:
+            # The disk cache is SQLite, which blocks, so consult it off the event loop
+            cached = (
+                await asyncio.to_thread(_disk_cache_lookup, key) if _disk_cache is not None else _disk_cache_lookup(key)
+            )
+        if cached is not None:
+            return cached
+
+    if client is None:
+        async with _async_sparql_client(max_connections=1) as own_client:
+            results = await _aexecute_query(own_client, query, max_retries, retry_delay, retry_backoff)
+    else:
+        results = await _aexecute_query(client, query, max_retries, retry_delay, retry_backoff)
+
+    if use_cache:
+        _memory_cache_put(key, results)
+        if _disk_cache is not None:
+            await asyncio.to_thread(_disk_cache_put, key, results)
+    return results
+
+
+async def _aexecute_query(
+    client: httpx.AsyncClient,
+    query: str,
+    max_retries: int,
+    retry_delay: float,
+    retry_backoff: float,
+) -> dict:
+    """POST a query to the SPARQL endpoint, retrying transient failures."""
+    last_error: Exception | None = None
+    status_code: int | None = None
+    retry_after: str | None = None
+    current_delay = retry_delay
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.post(
+                EURLEX_SPARQL_URL,
+                data={"query": query},
+                headers={"Accept": SPARQL_JSON_RESULTS},
+            )
+            response.raise_for_status()
+            return dict(_json_loads(response.content))
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            if status_code not in _SPARQL_RETRYABLE_STATUS_CODES:
+                raise SPARQLServiceError(f"SPARQL query error: {e}", status_code=status_code) from e
+            retry_after = e.response.headers.get("Retry-After")
+            last_error = e
+        except httpx.TransportError as e:
+            status_code = None
+            retry_after = None
+            last_error = e
+
+        if attempt < max_retries:
+            wait = _retry_wait(current_delay, status_code, retry_after)
+            logger.warning(
+                "SPARQL query failed (attempt %d/%d, status=%s): %s. Retrying in %.1fs...",
+                attempt + 1,
+                max_retries + 1,
+                status_code,
+                str(last_error)[:100],
+                wait,
+            )
+            await asyncio.sleep(wait)
+            current_delay = min(current_delay * retry_backoff, MAX_RETRY_DELAY)
+        else:
+            logger.error("SPARQL query failed after %d attempts: %s", max_retries + 1, last_error)
+
+    raise SPARQLServiceError(
+        f"SPARQL endpoint unavailable after {max_retries + 1} attempts. Last error: {last_error}",
+        status_code=status_code,
+    )
+
+
+async def arun_queries(
+    queries: list[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    **kwargs: Any,
+) -> list[dict]:
+    """Run several SPARQL queries concurrently over one pooled connection set.
+
+    Parameters
+    ----------
+    queries : list[str]
+        The SPARQL queries to run.
+    max_concurrency : int
+        Maximum number of queries in flight at once (default: 4). Keep this low
+        to avoid being throttled by the endpoint.
+    **kwargs
+        Passed to :func:`arun_query` (``max_retries``, ``use_cache``, ...).
+
+    Returns
+    -------
+    list[dict]
+        The results, in the same order as ``queries``.
+
+    Raises
+    ------
+    SPARQLServiceError
+        If any query fails after all retries.
+
+    Examples
+    --------
+    >>> results = await arun_queries([query_a, query_b])  # doctest: +SKIP
+    >>> results = asyncio.run(arun_queries([query_a, query_b]))  # From sync code  # doctest: +SKIP
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with _async_sparql_client(max_connections=max_concurrency) as client:
+
+        async def run_one(query: str) -> dict:
+            async with semaphore:
+                return await arun_query(query, client=client, **kwargs)
+
+        return list(await asyncio.gather(*(run_one(q) for q in queries)))
+
+
 def convert_sparql_output_to_dataframe(sparql_results: dict) -> pl.DataFrame:
     """Convert SPARQL output to a DataFrame.
 
@@ -167,15 +872,54 @@ def convert_sparql_output_to_dataframe(sparql_results: dict) -> pl.DataFrame:
     >>> convert_sparql_output_to_dataframe({'results': {'bindings': [{'subject': {'value': 'cdm:test'}}]}}).to_dicts()
     [{'subject': 'cdm:test'}]
     """
-    from eurlxp.client import simplify_iri
+    bindings = sparql_results["results"]["bindings"]
+    if not bindings:
+        return pl.DataFrame()
+
+    # Build column-wise: variables left unbound in a row (OPTIONAL) become nulls
+    columns = list(dict.fromkeys(key for binding in bindings for key in binding))
+    data = {
+        column: [binding[column]["value"] if column in binding else None for binding in bindings] for column in columns
+    }
+    df = pl.DataFrame(data, schema=dict.fromkeys(columns, pl.String))
+    # Simplify IRIs in polars rather than per cell in Python
+    return df.with_columns(_simplify_iri_expr(column) for column in columns)
 
-    items = [{key: simplify_iri(item[key]["value"]) for key in item} for item in sparql_results["results"]["bindings"]]
-    return pl.DataFrame(items) if items else pl.DataFrame()
+
+CELEX_RESOURCE_URI = "http://publications.europa.eu/resource/celex/{celex_id}"
+NTRIPLES_MIME_TYPE = "application/n-triples"
+
+
+class _ByteStreamReader(io.RawIOBase):
+    """Expose an iterator of byte chunks as a readable binary file."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
 
 
 def get_celex_dataframe(celex_id: str) -> pl.DataFrame:
     """Get CELEX data delivered in a DataFrame.
 
+    The RDF is fetched over the pooled SPARQL connection and requested as
+    N-Triples, which are parsed line by line while the response streams in, so
+    no intermediate ``rdflib.Graph`` is built. If the server answers in another
+    RDF serialization, the buffered bytes are parsed with rdflib instead.
+
     Parameters
     ----------
     celex_id : str
@@ -184,27 +928,92 @@ def get_celex_dataframe(celex_id: str) -> pl.DataFrame:
     Returns
     -------
     pl.DataFrame
-        A DataFrame containing the results with columns 's', 'o', 'p'.
+        A DataFrame with one row per triple and columns 's' (subject),
+        'p' (predicate) and 'o' (object).
     """
     _check_sparql_dependencies()
     import rdflib
+    from rdflib.plugins.parsers.ntriples import DummySink, W3CNTriplesParser
+
+    s_col: list[str] = []
+    p_col: list[str] = []
+    o_col: list[str] = []
+
+    class ColumnSink(DummySink):
+        def triple(self, s: Any, p: Any, o: Any) -> None:
+            s_col.append(str(s))
+            p_col.append(str(p))
+            o_col.append(str(o))
+
+    url = CELEX_RESOURCE_URI.format(celex_id=celex_id) + "?language=eng"
+    headers = {"Accept": f"{NTRIPLES_MIME_TYPE}, application/rdf+xml;q=0.5"}
+    with _get_sparql_client().stream(
+        "GET", url, headers=headers, follow_redirects=True, timeout=_sync_timeout()
+    ) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        sink = ColumnSink()
+        if content_type == NTRIPLES_MIME_TYPE:
+            text = io.TextIOWrapper(io.BufferedReader(_ByteStreamReader(response.iter_bytes())), encoding="utf-8")
+            W3CNTriplesParser(sink).parse(text)
+        else:
+            graph = rdflib.Graph()
+            graph.parse(data=response.read(), format=content_type or "application/rdf+xml")
+            for s, p, o in graph:
+                sink.triple(s, p, o)
+
+    df = pl.DataFrame({"s": s_col, "p": p_col, "o": o_col}, schema=dict.fromkeys(("s", "p", "o"), pl.String))
+    return df.with_columns(_simplify_iri_expr(c) for c in df.columns)
+
+
+def get_celex_dataframes(
+    celex_ids: list[str],
+    max_workers: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, pl.DataFrame]:
+    """Get the CELEX data of several documents concurrently.
+
+    The documents are fetched with :func:`get_celex_dataframe` on a thread
+    pool, sharing its pooled keep-alive connections.
 
-    from eurlxp.client import simplify_iri
+    Parameters
+    ----------
+    celex_ids : list[str]
+        The CELEX IDs to get the data for. Duplicates are fetched once.
+    max_workers : int
+        Maximum number of documents fetched at once (default: 4). Keep this low
+        to avoid being throttled by the endpoint.
 
-    graph = rdflib.Graph()
-    graph.parse(f"http://publications.europa.eu/resource/celex/{celex_id}?language=eng")
+    Returns
+    -------
+    dict[str, pl.DataFrame]
+        Mapping from each CELEX ID to its DataFrame, in the order of ``celex_ids``.
 
-    items = [
-        {"s": simplify_iri(str(item[0])), "o": simplify_iri(str(item[1])), "p": simplify_iri(str(item[2]))}
-        for item in graph
-    ]
-    return pl.DataFrame(items) if items else pl.DataFrame(schema={"s": pl.String, "o": pl.String, "p": pl.String})
+    Examples
+    --------
+    >>> frames = get_celex_dataframes(["32019R0947", "32016R0679"])  # doctest: +SKIP
+    """
+    unique_ids = list(dict.fromkeys(celex_ids))
+    if len(unique_ids) <= 1:
+        return {celex_id: get_celex_dataframe(celex_id) for celex_id in unique_ids}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as executor:
+        return dict(zip(unique_ids, executor.map(get_celex_dataframe, unique_ids), strict=True))
+
+
+# Candidate CELEX IDs bound per VALUES query, roughly three slash notations' worth
+CELEX_CANDIDATES_PER_QUERY = 360
+
+_CELEX_CANDIDATES_QUERY = prepend_prefixes(
+    "SELECT DISTINCT ?candidate ?o WHERE {{ "
+    "VALUES ?candidate {{ {values} }} ?s owl:sameAs ?candidate . ?s owl:sameAs ?o }}"
+)
 
 
 def guess_celex_ids_via_eurlex(
     slash_notation: str,
     document_type: str | None = None,
     sector_id: str | None = None,
+    max_results: int | None = None,
 ) -> list[str]:
     """Guess CELEX IDs for a slash notation by looking it up via EUR-Lex.
 
@@ -216,35 +1025,84 @@ def guess_celex_ids_via_eurlex(
         The type of the document (e.g. "R" for regulations).
     sector_id : str, optional
         The sector ID (e.g. "3").
+    max_results : int, optional
+        Stop once this many CELEX IDs have been found. By default all are returned.
 
     Returns
     -------
     list[str]
-        A list of possible CELEX IDs.
+        A list of possible CELEX IDs, sorted.
 
     Examples
     --------
     >>> celex_ids = guess_celex_ids_via_eurlex("2019/947")  # doctest: +SKIP
+    >>> celex_id = guess_celex_ids_via_eurlex("2019/947", max_results=1)  # doctest: +SKIP
     """
-    from eurlxp.client import prepend_prefixes
-    from eurlxp.parser import get_possible_celex_ids
+    return guess_celex_ids_via_eurlex_bulk([slash_notation], document_type, sector_id, max_results)[slash_notation]
 
-    slash_notation = "/".join(slash_notation.split("/")[:2])
-    possible_ids = get_possible_celex_ids(slash_notation, document_type, sector_id)
 
-    queries = [f"{{ ?s owl:sameAs celex:{celex_id} . ?s owl:sameAs ?o }}" for celex_id in possible_ids]
-    query = "SELECT * WHERE {" + " UNION ".join(queries) + "}"
-    query = prepend_prefixes(query)
+def guess_celex_ids_via_eurlex_bulk(
+    slash_notations: list[str],
+    document_type: str | None = None,
+    sector_id: str | None = None,
+    max_results: int | None = None,
+) -> dict[str, list[str]]:
+    """Guess CELEX IDs for several slash notations with as few SPARQL queries as possible.
 
-    results = run_query(query.strip())
+    The candidate CELEX IDs of all notations are bound in a ``VALUES`` clause,
+    so several notations share one round trip instead of one query each.
 
-    celex_ids: list[str] = []
-    for binding in results["results"]["bindings"]:
-        if "/celex/" in binding["o"]["value"]:
+    Parameters
+    ----------
+    slash_notations : list[str]
+        The slash notations of the documents (like ["2019/947", "2016/679"]).
+    document_type : str, optional
+        The type of the documents (e.g. "R" for regulations).
+    sector_id : str, optional
+        The sector ID (e.g. "3").
+    max_results : int, optional
+        Return at most this many CELEX IDs per notation, and send no further
+        queries once every notation has that many. By default all are returned.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Mapping from each slash notation to the (sorted) CELEX IDs found for it.
+
+    Examples
+    --------
+    >>> guess_celex_ids_via_eurlex_bulk(["2019/947", "2016/679"])  # doctest: +SKIP
+    {'2019/947': ['32019R0947'], '2016/679': ['32016R0679']}
+    """
+    # Generate the candidates once per distinct "year/number", however often it is given
+    notations_by_reference: dict[str, list[str]] = {}
+    for slash_notation in dict.fromkeys(slash_notations):
+        reference = "/".join(slash_notation.split("/")[:2])
+        notations_by_reference.setdefault(reference, []).append(slash_notation)
+
+    candidate_notations: dict[str, list[str]] = {}
+    for reference, notations in notations_by_reference.items():
+        for celex_id in get_possible_celex_ids(reference, document_type, sector_id):
+            candidate_notations.setdefault(celex_id, []).extend(notations)
+
+    found: dict[str, set[str]] = {slash_notation: set() for slash_notation in slash_notations}
+    candidates = list(candidate_notations)
+    for start in range(0, len(candidates), CELEX_CANDIDATES_PER_QUERY):
+        values = " ".join(f"celex:{c}" for c in candidates[start : start + CELEX_CANDIDATES_PER_QUERY])
+        results = run_query(_CELEX_CANDIDATES_QUERY.format(values=values).strip())
+
+        for binding in results["results"]["bindings"]:
+            if "/celex/" not in binding["o"]["value"]:
+                continue
             celex_id = binding["o"]["value"].split("/")[-1]
-            celex_ids.append(celex_id)
+            candidate = binding["candidate"]["value"].split("/")[-1]
+            for slash_notation in candidate_notations.get(candidate, []):
+                found[slash_notation].add(celex_id)
+
+        if max_results is not None and all(len(celex_ids) >= max_results for celex_ids in found.values()):
+            break
 
-    return list(set(celex_ids))
+    return {slash_notation: sorted(celex_ids)[:max_results] for slash_notation, celex_ids in found.items()}
 
 
 @dataclass
@@ -269,10 +1127,15 @@ class DocumentReference:
     document_date: str
 
 
+# Server-side equivalent of is_valid_celex_id (minus the year range check)
+_CELEX_URI_FILTER = f'regex(str(?celexUri), "^celex:{CELEX_ID_PATTERN}$") && !contains(str(?celexUri), "/")'
+
+
 def get_ids_and_urls_via_date(
     from_date: str,
     to_date: str | None = None,
     date_type: DateType | str = DateType.DOCUMENT,
+    include_nonstandard: bool = True,
 ) -> list[DocumentReference]:
     """Get document references for a date range via SPARQL.
 
@@ -301,6 +1164,11 @@ def get_ids_and_urls_via_date(
         regardless of their original publication year. This is useful for
         catching amendments to old documents (e.g., a 2020 directive
         amended in 2026 will be found when querying 2026 modifications).
+    include_nonstandard : bool, optional
+        If True (default), also return documents whose ID is not in standard
+        CELEX format, with ``celex_id`` set to None. If False, the endpoint
+        only returns well-formed CELEX IDs, which makes large date ranges
+        cheaper to transfer and process.
 
     Returns
     -------
@@ -325,8 +1193,6 @@ def get_ids_and_urls_via_date(
     >>> for doc in docs:  # doctest: +SKIP
     ...     html = get_html_by_cellar_url(doc.cellar_url)
     """
-    from eurlxp.parser import is_valid_celex_id
-
     if to_date is None:
         to_date = from_date
 
@@ -341,6 +1207,7 @@ def get_ids_and_urls_via_date(
         DateType.MODIFIED: "cdm:work_date_lastUpdate",
     }
     date_predicate = date_predicates[date_type]
+    id_filter = 'regex(str(?celexUri), "celex")' if include_nonstandard else _CELEX_URI_FILTER
 
     query = f"""
 SELECT ?work (STRAFTER(STR(?celexUri), "celex:") AS ?celexId) ?celexUri ?targetDate
@@ -351,7 +1218,7 @@ WHERE {{
 
     FILTER(?targetDate >= "{from_date}"^^xsd:date &&
            ?targetDate <= "{to_date}"^^xsd:date &&
-           regex(str(?celexUri), "celex"))
+           {id_filter})
 }}
 ORDER BY DESC(?targetDate)"""
 
@@ -365,8 +1232,11 @@ ORDER BY DESC(?targetDate)"""
         cellar_url = binding["work"]["value"]
         document_date = binding["targetDate"]["value"]
 
-        # Validate CELEX ID - set to None if not standard format
+        # Validate CELEX ID - set to None if not standard format. The server-side
+        # filter can't check the year range, so validation still runs when it's used.
         celex_id = raw_id if is_valid_celex_id(raw_id) else None
+        if celex_id is None and not include_nonstandard:
+            continue
 
         documents.append(
             DocumentReference(
@@ -380,17 +1250,24 @@ ORDER BY DESC(?targetDate)"""
     return documents
 
 
-def lookup_cellar_url(identifier: str) -> str | None:
+def lookup_cellar_url(identifier: str, verify: bool = False) -> str | None:
     """Look up the cellar URL for any EUR-Lex identifier via SPARQL.
 
     This function queries the SPARQL endpoint to find the cellar URL
     for any identifier, including OJ references (like C/2026/00064)
     that are not valid CELEX IDs.
 
+    Valid CELEX IDs don't need a query: their CELEX resource URI
+    (``http://publications.europa.eu/resource/celex/{celex_id}``) resolves to
+    the same cellar work and is returned directly, unless ``verify`` is set.
+
     Parameters
     ----------
     identifier : str
         Any EUR-Lex document identifier (CELEX ID, OJ reference, etc.).
+    verify : bool, optional
+        If True, always query SPARQL, so a valid CELEX ID only yields a URL
+        when the document actually exists. Default is False.
 
     Returns
     -------
@@ -399,9 +1276,14 @@ def lookup_cellar_url(identifier: str) -> str | None:
 
     Examples
     --------
+    >>> lookup_cellar_url("32019R0947")
+    'http://publications.europa.eu/resource/celex/32019R0947'
     >>> url = lookup_cellar_url("C/2026/00064")  # doctest: +SKIP
-    >>> url = lookup_cellar_url("32019R0947")  # doctest: +SKIP
+    >>> url = lookup_cellar_url("32019R0947", verify=True)  # doctest: +SKIP
     """
+    if not verify and is_valid_celex_id(identifier):
+        return CELEX_RESOURCE_URI.format(celex_id=identifier)
+
     # Query to find the work (cellar URL) for any identifier
     # The identifier might be in cdm:work_id_document or cdm:resource_legal_id_celex
     query = f"""
@@ -426,12 +1308,172 @@ LIMIT 1"""
         if results["results"]["bindings"]:
             return results["results"]["bindings"][0]["work"]["value"]
     except Exception as e:
-        logger.warning(f"SPARQL lookup failed for '{identifier}': {e}")
+        logger.warning("SPARQL lookup failed for '%s': %s", identifier, e)
 
     return None
 
 
-def get_regulations(limit: int = -1, shuffle: bool = False) -> list[str]:
+def _sparql_string(value: str) -> str:
+    """Quote a value as a SPARQL string literal."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+# Identifiers per VALUES block in lookup_cellar_urls, keeping queries well under URL length limits
+LOOKUP_BATCH_SIZE = 50
+
+
+def lookup_cellar_urls(identifiers: list[str], batch_size: int = LOOKUP_BATCH_SIZE) -> dict[str, str | None]:
+    """Look up the cellar URLs for many EUR-Lex identifiers with batched SPARQL queries.
+
+    Equivalent to calling :func:`lookup_cellar_url` with ``verify=True`` for each identifier, but binds up to
+    ``batch_size`` identifiers per query with a ``VALUES`` clause, so N lookups cost
+    ``ceil(N / batch_size)`` round trips instead of N.
+
+    Parameters
+    ----------
+    identifiers : list[str]
+        EUR-Lex document identifiers (CELEX IDs, OJ references, etc.).
+    batch_size : int
+        Maximum number of identifiers per query (default: 50).
+
+    Returns
+    -------
+    dict[str, str | None]
+        Mapping from each identifier to its cellar URL, or None if not found
+        (or if the query for its batch failed). Keys keep the input order.
+
+    Examples
+    --------
+    >>> urls = lookup_cellar_urls(["32019R0947", "C/2026/00064"])  # doctest: +SKIP
+    >>> urls["32019R0947"]  # doctest: +SKIP
+    'http://publications.europa.eu/resource/cellar/...'
+    """
+    found: dict[str, str | None] = dict.fromkeys(identifiers)
+    unique_ids = list(found)
+
+    for start in range(0, len(unique_ids), batch_size):
+        batch = unique_ids[start : start + batch_size]
+        values = " ".join(_sparql_string(i) for i in batch)
+        query = f"""
+SELECT DISTINCT ?id ?work
+WHERE {{
+    VALUES ?id {{ {values} }}
+    {{
+        ?work cdm:work_id_document ?idUri .
+        FILTER(CONTAINS(STR(?idUri), ?id))
+    }}
+    UNION
+    {{
+        ?work cdm:resource_legal_id_celex ?id .
+    }}
+}}"""
+
+        try:
+            results = run_query(prepend_prefixes(query).strip())
+        except Exception as e:
+            logger.warning("SPARQL batch lookup failed for %d identifiers: %s", len(batch), e)
+            continue
+
+        for binding in results["results"]["bindings"]:
+            identifier = binding["id"]["value"]
+            if identifier in found and found[identifier] is None:
+                found[identifier] = binding["work"]["value"]
+
+    return found
+
+
+RESOURCE_TYPE_URI = "http://publications.europa.eu/resource/authority/resource-type/{}"
+
+_REGULATIONS_QUERY = (
+    f"SELECT distinct ?doc WHERE {{ ?doc cdm:work_has_resource-type <{RESOURCE_TYPE_URI.format('REG')}> }}"
+)
+
+_DOCUMENTS_QUERY = """select distinct ?doc ?type ?celex ?date
+where{{
+  VALUES ?type {{ {type_values} }}
+  ?doc cdm:work_has_resource-type ?type ;
+       cdm:resource_legal_id_celex ?celex .
+  OPTIONAL{{?doc cdm:work_date_document ?date.}}
+}}
+ORDER BY ?doc ?type ?celex ?date"""
+
+
+@lru_cache(maxsize=64)
+def _documents_query(types: tuple[str, ...]) -> str:
+    """Build the paged documents query for the given resource types."""
+    # Bind the types up front so each one is an index lookup rather than a scan-then-filter
+    type_values = " ".join(f"<{RESOURCE_TYPE_URI.format(t)}>" for t in types)
+    return _DOCUMENTS_QUERY.format(type_values=type_values)
+
+
+# Rows fetched per query when paging through get_regulations / get_documents
+DOCUMENTS_PAGE_SIZE = 1000
+
+
+def _iter_paged_rows(query: str, limit: int, page_size: int, prefetch: int = 1) -> Iterator[dict[str, str]]:
+    """Yield the rows of an ``ORDER BY`` query page by page with ``LIMIT``/``OFFSET``.
+
+    Pages are requested as CSV (and cached like ``run_query_csv`` results),
+    so each row is a flat dict of raw string values, with ``""`` for unbound
+    variables. Up to ``prefetch`` further
+    pages are fetched in the background while the current one is consumed.
+
+    Only an empty page ends the scan. The endpoint may cut a page short of
+    ``LIMIT`` (it caps the rows of a single response), so after a short page
+    paging resumes right after the last row received.
+    """
+
+    prefixed_query = prepend_prefixes(query)
+
+    def fetch(offset: int, size: int) -> pl.DataFrame:
+        body = _send_csv_query(
+            f"{prefixed_query} LIMIT {size} OFFSET {offset}",
+            DEFAULT_MAX_RETRIES,
+            DEFAULT_RETRY_DELAY,
+            DEFAULT_RETRY_BACKOFF,
+            use_cache=True,
+        )
+        return pl.read_csv(io.BytesIO(body), infer_schema_length=0).fill_null("") if body.strip() else pl.DataFrame()
+
+    def windows(start: int) -> Iterator[tuple[int, int]]:
+        offset = start
+        while limit <= 0 or offset < limit:
+            size = page_size if limit <= 0 else min(page_size, limit - offset)
+            yield offset, size
+            offset += size
+
+    prefetch = max(1, prefetch)
+    remaining = windows(0)
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    try:
+        pending = deque(
+            (offset, size, executor.submit(fetch, offset, size)) for offset, size in islice(remaining, prefetch)
+        )
+        while pending:
+            offset, size, future = pending.popleft()
+            page = future.result()
+            if page.height == 0:
+                return
+            if page.height < size:
+                # The pages in flight start past rows this one didn't return; refetch from the first missing row
+                for _, _, stale in pending:
+                    stale.cancel()
+                pending.clear()
+                remaining = windows(offset + page.height)
+            for next_offset, next_size in islice(remaining, prefetch - len(pending)):
+                pending.append((next_offset, next_size, executor.submit(fetch, next_offset, next_size)))
+            yield from page.iter_rows(named=True)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_regulations(
+    limit: int = -1,
+    shuffle: bool = False,
+    page_size: int = DOCUMENTS_PAGE_SIZE,
+    prefetch: int = 1,
+) -> list[str]:
     """Retrieve a list of CELLAR IDs for regulations from EUR-Lex.
 
     Parameters
@@ -439,7 +1481,12 @@ def get_regulations(limit: int = -1, shuffle: bool = False) -> list[str]:
     limit : int
         The maximum number of regulations to retrieve. -1 for no limit.
     shuffle : bool
-        Whether to shuffle the results.
+        Whether to shuffle the results. Shuffled results are fetched with a
+        single query rather than page by page.
+    page_size : int
+        Number of rows fetched per SPARQL query when not shuffling (default: 1000).
+    prefetch : int
+        Number of pages fetched ahead in the background (default: 1).
 
     Returns
     -------
@@ -450,26 +1497,46 @@ def get_regulations(limit: int = -1, shuffle: bool = False) -> list[str]:
     --------
     >>> cellar_ids = get_regulations(limit=5)  # doctest: +SKIP
     """
-    from eurlxp.client import prepend_prefixes
-
-    query = (
-        "SELECT distinct ?doc WHERE { "
-        "?doc cdm:work_has_resource-type <http://publications.europa.eu/resource/authority/resource-type/REG> "
-        "}" + (" order by rand()" if shuffle else "") + (f" limit {limit}" if limit > 0 else "")
-    )
+    if not shuffle:
+        return list(iter_regulations(limit=limit, page_size=page_size, prefetch=prefetch))
 
+    query = _REGULATIONS_QUERY + " order by rand()" + (f" limit {limit}" if limit > 0 else "")
     results = run_query(prepend_prefixes(query))
+    return [result["doc"]["value"].rpartition("/")[2] for result in results["results"]["bindings"]]
+
 
-    cellar_ids: list[str] = []
-    for result in results["results"]["bindings"]:
-        cellar_ids.append(result["doc"]["value"].split("/")[-1])
+def iter_regulations(limit: int = -1, page_size: int = DOCUMENTS_PAGE_SIZE, prefetch: int = 1) -> Iterator[str]:
+    """Iterate over the CELLAR IDs of regulations, fetching them page by page.
 
-    return cellar_ids
+    Parameters
+    ----------
+    limit : int
+        The maximum number of regulations to retrieve. -1 for no limit.
+    page_size : int
+        Number of rows fetched per SPARQL query (default: 1000).
+    prefetch : int
+        Number of pages fetched ahead in the background while the current
+        one is consumed (default: 1).
+
+    Yields
+    ------
+    str
+        CELLAR IDs, in a stable order.
+
+    Examples
+    --------
+    >>> for cellar_id in iter_regulations():  # doctest: +SKIP
+    ...     print(cellar_id)
+    """
+    for row in _iter_paged_rows(_REGULATIONS_QUERY + " ORDER BY ?doc", limit, page_size, prefetch):
+        yield row["doc"].rpartition("/")[2]
 
 
 def get_documents(
     types: list[str] | None = None,
     limit: int = -1,
+    page_size: int = DOCUMENTS_PAGE_SIZE,
+    prefetch: int = 1,
 ) -> list[dict[str, str]]:
     """Retrieve a list of documents of specified types from EUR-Lex.
 
@@ -480,6 +1547,10 @@ def get_documents(
         Examples: ["DIR", "DIR_IMPL", "DIR_DEL", "REG", "REG_IMPL", "REG_FINANC", "REG_DEL"]
     limit : int
         The maximum number of documents to retrieve. -1 for no limit.
+    page_size : int
+        Number of rows fetched per SPARQL query (default: 1000).
+    prefetch : int
+        Number of pages fetched ahead in the background (default: 1).
 
     Returns
     -------
@@ -490,39 +1561,49 @@ def get_documents(
     --------
     >>> docs = get_documents(types=["REG"], limit=5)  # doctest: +SKIP
     """
-    from eurlxp.client import prepend_prefixes
+    return list(iter_documents(types, limit=limit, page_size=page_size, prefetch=prefetch))
 
-    if types is None:
-        types = ["REG"]
 
-    type_filters = " ||\n    ".join(
-        f"?type=<http://publications.europa.eu/resource/authority/resource-type/{t}>" for t in types
-    )
+def iter_documents(
+    types: list[str] | None = None,
+    limit: int = -1,
+    page_size: int = DOCUMENTS_PAGE_SIZE,
+    prefetch: int = 1,
+) -> Iterator[dict[str, str]]:
+    """Iterate over documents of specified types from EUR-Lex, fetching them page by page.
 
-    query = f"""select distinct ?doc ?type ?celex ?date
-where{{ ?doc cdm:work_has_resource-type ?type.
-  FILTER(
-    {type_filters}
-  )
-  FILTER(BOUND(?celex))
-  OPTIONAL{{?doc cdm:resource_legal_id_celex ?celex.}}
-  OPTIONAL{{?doc cdm:work_date_document ?date.}}
-}}
-"""
-    if limit > 0:
-        query += f"limit {limit}"
-
-    query_results = run_query(prepend_prefixes(query))
-
-    results: list[dict[str, str]] = []
-    for result in query_results["results"]["bindings"]:
-        results.append(
-            {
-                "celex": result.get("celex", {}).get("value", ""),
-                "date": result.get("date", {}).get("value", ""),
-                "link": result.get("doc", {}).get("value", ""),
-                "type": result.get("type", {}).get("value", "").split("/")[-1],
-            }
-        )
+    Unlike :func:`get_documents`, results are yielded as each page arrives, so
+    scanning a large document class never holds the full result set in memory
+    and no single query has to return it.
 
-    return results
+    Parameters
+    ----------
+    types : list[str], optional
+        The types of documents to return. Defaults to ["REG"].
+    limit : int
+        The maximum number of documents to retrieve. -1 for no limit.
+    page_size : int
+        Number of rows fetched per SPARQL query (default: 1000).
+    prefetch : int
+        Number of pages fetched ahead in the background while the current
+        one is consumed (default: 1).
+
+    Yields
+    ------
+    dict[str, str]
+        Dicts containing 'celex', 'date', 'link', and 'type', in a stable order.
+
+    Examples
+    --------
+    >>> for doc in iter_documents(types=["DIR"]):  # doctest: +SKIP
+    ...     print(doc["celex"])
+    """
+    query = _documents_query(("REG",) if types is None else tuple(types))
+
+    for row in _iter_paged_rows(query, limit, page_size, prefetch):
+        yield {
+            "celex": row["celex"],
+            "date": row["date"],
+            "link": row["doc"],
+            "type": row["type"].rpartition("/")[2],
+        }
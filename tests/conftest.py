@@ -1,11 +1,43 @@
 """Pytest configuration and fixtures."""
 
+from pathlib import Path
+
 import pytest
 
+INTEGRATION_DIR = Path(__file__).parent / "integration"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the ``--integration`` option."""
+    parser.addoption(
+        "--integration",
+        action="store_true",
+        default=False,
+        help="collect the network-bound tests in tests/integration",
+    )
+
+
+def pytest_ignore_collect(collection_path: Path, config: pytest.Config) -> bool | None:
+    """Skip collecting tests/integration unless ``--integration`` is given."""
+    if collection_path == INTEGRATION_DIR and not config.getoption("--integration"):
+        return True
+    return None
+
 
 def pytest_configure(config: pytest.Config) -> None:
     """Register custom markers."""
     config.addinivalue_line("markers", "integration: marks tests as integration tests (require network)")
+    # Registered by pytest-xdist when installed; declared here so runs without it don't warn
+    config.addinivalue_line("markers", "xdist_group(name): run tests of a group on the same pytest-xdist worker")
+
+
+@pytest.fixture(autouse=True)
+def isolated_query_cache() -> None:
+    """Keep cached SPARQL results from leaking between tests or in from a real cache directory."""
+    from eurlxp.sparql import clear_query_cache, disable_disk_cache
+
+    disable_disk_cache()
+    clear_query_cache()
 
 
 @pytest.fixture
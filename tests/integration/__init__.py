@@ -0,0 +1 @@
+"""Integration tests that talk to the live EUR-Lex endpoints."""
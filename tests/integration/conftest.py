@@ -0,0 +1,14 @@
+"""Fixtures for the integration tests."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from eurlxp import EURLexClient
+
+
+@pytest.fixture(scope="session")
+def shared_client() -> Iterator[EURLexClient]:
+    """One EURLexClient for the whole run, so its connection pool is reused across tests."""
+    with EURLexClient() as client:
+        yield client
@@ -0,0 +1,24 @@
+"""Integration tests for the client module (require network)."""
+
+import pytest
+
+from eurlxp import EURLexClient, WAFChallengeError, get_html_by_celex_id
+
+pytestmark = pytest.mark.integration
+
+
+def test_get_html_by_celex_id_integration(shared_client: EURLexClient) -> None:
+    """Integration test - may raise WAFChallengeError if blocked."""
+    try:
+        html = shared_client.get_html_by_celex_id("32019R0947")
+        assert len(html) > 0
+    except WAFChallengeError:
+        pytest.skip("EUR-Lex is blocking requests with WAF challenge")
+
+
+def test_get_html_by_celex_id_function() -> None:
+    try:
+        html = get_html_by_celex_id("32019R0947")
+        assert len(html) > 0
+    except WAFChallengeError:
+        pytest.skip("EUR-Lex is blocking requests with WAF challenge")
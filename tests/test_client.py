@@ -1,8 +1,17 @@
-"""Tests for the client module."""
+"""Tests for the client module.
 
-import time
-from unittest.mock import MagicMock, patch
+All I/O here is stubbed, so the tests can run in parallel under pytest-xdist
+(``-n auto --dist loadgroup``). ``TestGlobalConfig`` swaps the process-wide
+default config and is kept in its own group.
+"""
 
+import re
+from collections.abc import Iterator
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
 import pytest
 
 from eurlxp.client import (
@@ -21,6 +30,110 @@ from eurlxp.client import (
     set_default_config,
     simplify_iri,
 )
+from eurlxp.models import EURLEX_PREFIXES
+
+pytestmark = pytest.mark.xdist_group("client_unit")
+
+# Canonical configs for the test matrix; ClientConfig is frozen, so they are shared
+DEFAULT_CONFIG = ClientConfig()
+NO_FALLBACK_CONFIG = ClientConfig(sparql_fallback=False)
+RAW_WAF_CONFIG = ClientConfig(raise_on_waf=False, sparql_fallback=False)
+
+NO_CELLAR_URL_ERROR = re.compile(r"SPARQL lookup found no results")
+_REQUEST = httpx.Request("GET", "https://eur-lex.europa.eu/")
+
+
+def _resp(text: str = "", status_code: int = 200) -> SimpleNamespace:
+    """A stand-in for the parts of ``httpx.Response`` the client reads."""
+    return SimpleNamespace(text=text, status_code=status_code, raise_for_status=lambda: None)
+
+
+WAF_HTML = '<script src="https://awswaf.com/challenge.js"></script>'
+OK_HTML = "<html><body>Content</body></html>"
+
+
+@pytest.fixture(scope="module")
+def waf_response() -> SimpleNamespace:
+    """A canned WAF challenge response, shared by the tests of this module."""
+    return _resp(WAF_HTML)
+
+
+@pytest.fixture(scope="module")
+def ok_response() -> SimpleNamespace:
+    """A canned document response, shared by the tests of this module."""
+    return _resp(OK_HTML)
+
+
+FROZEN_NOW = 1000.0
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Freeze ``time.monotonic`` at ``FROZEN_NOW`` and record ``time.sleep`` calls instead of sleeping."""
+    slept: list[float] = []
+    monkeypatch.setattr("eurlxp.client.time.monotonic", lambda: FROZEN_NOW)
+    monkeypatch.setattr("eurlxp.client.time.sleep", slept.append)
+    return slept
+
+
+@pytest.fixture(scope="module")
+def client() -> EURLexClient:
+    """A default-configured client shared by the tests of this module.
+
+    With no request delay it keeps no per-request state that matters, and its
+    HTTP client is replaced per test by ``stub_http``.
+    """
+    return EURLexClient(config=DEFAULT_CONFIG)
+
+
+@pytest.fixture(scope="module")
+def strict_client() -> EURLexClient:
+    """A shared client that raises on WAF challenges instead of falling back to SPARQL."""
+    return EURLexClient(config=NO_FALLBACK_CONFIG)
+
+
+@pytest.fixture(scope="module")
+def raw_waf_client() -> EURLexClient:
+    """A shared client that returns WAF challenge pages as-is."""
+    return EURLexClient(config=RAW_WAF_CONFIG)
+
+
+@pytest.fixture
+def preserve_default_config() -> Iterator[None]:
+    """Restore the process-wide default ClientConfig after the test."""
+    original = get_default_config()
+    yield
+    set_default_config(original)
+
+
+@pytest.fixture
+def stub_http(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Route EURLexClient requests to a stub HTTP client.
+
+    Every GET returns ``stub_http.response``; replace ``stub_http.get`` for
+    per-call behaviour.
+    """
+    stub = SimpleNamespace(response=_resp())
+    stub.get = lambda _url: stub.response
+    monkeypatch.setattr(EURLexClient, "_get_client", lambda _self: stub)
+    return stub
+
+
+@pytest.fixture
+def cellar_lookup(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Stub the SPARQL cellar URL lookup used for non-CELEX identifiers.
+
+    The lookup returns ``cellar_lookup.cellar_url`` (``None``, i.e. not found,
+    by default) and records the identifiers it was asked for in ``calls``.
+    """
+    stub = SimpleNamespace(cellar_url=None, calls=[])
+
+    def lookup(identifier: str) -> str | None:
+        stub.calls.append(identifier)
+        return stub.cellar_url
+
+    monkeypatch.setattr("eurlxp.sparql.lookup_cellar_url", lookup)
+    return stub
 
 
 class TestPrefixes:
@@ -45,12 +158,20 @@ class TestPrefixes:
         iri = "http://example.com/test"
         assert simplify_iri(iri) == "http://example.com/test"
 
+    def test_simplify_iri_every_known_prefix(self) -> None:
+        for prefix, url in EURLEX_PREFIXES.items():
+            assert simplify_iri(f"{url}x") == f"{prefix}:x"
+
+    def test_simplify_iri_only_matches_at_start(self) -> None:
+        iri = "http://example.com/?see=http://publications.europa.eu/ontology/cdm#test"
+        assert simplify_iri(iri) == iri
+
 
 class TestClientConfig:
     """Tests for ClientConfig dataclass."""
 
     def test_default_config_values(self) -> None:
-        config = ClientConfig()
+        config = DEFAULT_CONFIG
         assert config.timeout == DEFAULT_TIMEOUT
         assert config.request_delay == DEFAULT_REQUEST_DELAY
         assert config.use_browser_headers is True
@@ -58,29 +179,36 @@ class TestClientConfig:
         assert config.referer is None
         assert config.headers is None
 
+    def test_config_is_frozen_and_hashable(self) -> None:
+        with pytest.raises(FrozenInstanceError):
+            DEFAULT_CONFIG.timeout = 1.0  # type: ignore[misc]
+        assert ClientConfig() == DEFAULT_CONFIG
+        assert hash(ClientConfig()) == hash(DEFAULT_CONFIG)
+
+    def test_config_with_headers_is_hashable(self) -> None:
+        config = ClientConfig(headers={"X-B": "2", "X-A": "1"})
+        assert hash(config) == hash(ClientConfig(headers={"X-A": "1", "X-B": "2"}))
+        assert config.get_headers()["X-A"] == "1"
+
     def test_get_headers_with_browser_headers(self) -> None:
-        config = ClientConfig(use_browser_headers=True)
-        headers = config.get_headers()
-        assert "User-Agent" in headers
+        headers = ClientConfig(use_browser_headers=True).get_headers()
         assert "Mozilla" in headers["User-Agent"]
 
     def test_get_headers_with_minimal_headers(self) -> None:
-        config = ClientConfig(use_browser_headers=False)
-        headers = config.get_headers()
-        assert "User-Agent" in headers
+        headers = ClientConfig(use_browser_headers=False).get_headers()
         assert "eurlxp" in headers["User-Agent"]
 
     def test_get_headers_with_custom_headers(self) -> None:
-        config = ClientConfig(headers={"X-Custom": "test-value"})
-        headers = config.get_headers()
+        headers = ClientConfig(headers={"X-Custom": "test-value"}).get_headers()
+        assert {"User-Agent", "X-Custom"} <= headers.keys()
         assert headers["X-Custom"] == "test-value"
 
     def test_get_headers_with_referer(self) -> None:
-        config = ClientConfig(referer="https://example.com")
-        headers = config.get_headers()
-        assert headers["Referer"] == "https://example.com"
+        headers = ClientConfig(referer="https://example.com").get_headers()
+        assert headers.items() >= {("Referer", "https://example.com")}
 
 
+@pytest.mark.xdist_group("global_config_mutation")
 class TestGlobalConfig:
     """Tests for global configuration functions."""
 
@@ -88,34 +216,28 @@ class TestGlobalConfig:
         config = get_default_config()
         assert isinstance(config, ClientConfig)
 
+    @pytest.mark.usefixtures("preserve_default_config")
     def test_set_default_config(self) -> None:
-        original = get_default_config()
-        try:
-            new_config = ClientConfig(request_delay=5.0)
-            set_default_config(new_config)
-            assert get_default_config().request_delay == 5.0
-        finally:
-            set_default_config(original)
+        new_config = ClientConfig(request_delay=5.0)
+        set_default_config(new_config)
+        assert get_default_config() is new_config
 
 
 class TestWAFDetection:
     """Tests for WAF challenge detection."""
 
-    def test_is_waf_challenge_detects_awswaf(self) -> None:
-        html = '<script src="https://example.awswaf.com/challenge.js"></script>'
-        assert _is_waf_challenge(html) is True
-
-    def test_is_waf_challenge_detects_integration(self) -> None:
-        html = "<script>AwsWafIntegration.getToken()</script>"
-        assert _is_waf_challenge(html) is True
-
-    def test_is_waf_challenge_detects_noscript_message(self) -> None:
-        html = "<noscript>verify that you're not a robot</noscript>"
-        assert _is_waf_challenge(html) is True
-
-    def test_is_waf_challenge_returns_false_for_normal_html(self) -> None:
-        html = "<html><body><h1>Article 1</h1><p>Normal content</p></body></html>"
-        assert _is_waf_challenge(html) is False
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            ('<script src="https://example.awswaf.com/challenge.js"></script>', True),
+            ("<script>AwsWafIntegration.getToken()</script>", True),
+            ("<noscript>verify that you're not a robot</noscript>", True),
+            ("<html><body><h1>Article 1</h1><p>Normal content</p></body></html>", False),
+        ],
+        ids=["awswaf", "integration", "noscript_message", "normal_html"],
+    )
+    def test_is_waf_challenge(self, html: str, expected: bool) -> None:
+        assert _is_waf_challenge(html) is expected
 
     def test_waf_challenge_error_message(self) -> None:
         error = WAFChallengeError()
@@ -136,375 +258,230 @@ class TestEURLexClient:
         assert client._config.timeout == 45.0
         assert client._config.request_delay == 2.0
 
-    def test_client_rate_limiting(self) -> None:
+    def test_client_rate_limiting(self, frozen_clock: list[float]) -> None:
         client = EURLexClient(request_delay=0.1)
-        client._last_request_time = time.monotonic()
-        start = time.monotonic()
+        client._last_request_time = FROZEN_NOW - 0.03
         client._apply_rate_limit()
-        elapsed = time.monotonic() - start
-        assert elapsed >= 0.05  # Should have waited at least some time
-
-    def test_client_raises_waf_error(self) -> None:
-        waf_html = '<script src="https://awswaf.com/challenge.js"></script>'
-        mock_response = MagicMock()
-        mock_response.text = waf_html
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            # Disable sparql_fallback to test WAF error raising
-            config = ClientConfig(sparql_fallback=False)
-            client = EURLexClient(config=config)
-            with pytest.raises(WAFChallengeError):
-                client.get_html_by_celex_id("32019R0947")
-
-    def test_client_does_not_raise_waf_when_disabled(self) -> None:
-        waf_html = '<script src="https://awswaf.com/challenge.js"></script>'
-        mock_response = MagicMock()
-        mock_response.text = waf_html
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            # Disable both raise_on_waf and sparql_fallback to get raw HTML
-            config = ClientConfig(raise_on_waf=False, sparql_fallback=False)
-            client = EURLexClient(config=config)
-            html = client.get_html_by_celex_id("32019R0947")
-            assert "awswaf" in html
-
-    def test_client_sparql_fallback_on_waf(self) -> None:
-        waf_html = '<script src="https://awswaf.com/challenge.js"></script>'
-        mock_response = MagicMock()
-        mock_response.text = waf_html
-        mock_response.raise_for_status = MagicMock()
-
-        with (
-            patch.object(EURLexClient, "_get_client") as mock_get_client,
-            patch("eurlxp.client._fetch_html_via_sparql") as mock_sparql,
-        ):
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
+        assert frozen_clock == [pytest.approx(0.07)]  # Waits out the rest of the delay
+        assert client._last_request_time == FROZEN_NOW
+
+    def test_client_raises_waf_error(
+        self, stub_http: SimpleNamespace, waf_response: SimpleNamespace, strict_client: EURLexClient
+    ) -> None:
+        stub_http.response = waf_response
+
+        # sparql_fallback is disabled to test WAF error raising
+        with pytest.raises(WAFChallengeError):
+            strict_client.get_html_by_celex_id("32019R0947")
+
+    def test_client_does_not_raise_waf_when_disabled(
+        self, stub_http: SimpleNamespace, waf_response: SimpleNamespace, raw_waf_client: EURLexClient
+    ) -> None:
+        stub_http.response = waf_response
+
+        # Disable both raise_on_waf and sparql_fallback to get raw HTML
+        html = raw_waf_client.get_html_by_celex_id("32019R0947")
+        assert "awswaf" in html
+
+    def test_client_sparql_fallback_on_waf(
+        self, stub_http: SimpleNamespace, waf_response: SimpleNamespace, client: EURLexClient
+    ) -> None:
+        stub_http.response = waf_response
+
+        # sparql_fallback is enabled by default
+        with patch("eurlxp.client._fetch_html_via_sparql") as mock_sparql:
             mock_sparql.return_value = "<html><body>SPARQL fallback content</body></html>"
 
-            config = ClientConfig(sparql_fallback=True)
-            client = EURLexClient(config=config)
             html = client.get_html_by_celex_id("32019R0947")
             assert "SPARQL fallback content" in html
             mock_sparql.assert_called_once_with("32019R0947", "en")
 
     def test_sparql_fallback_config_default_true(self) -> None:
-        config = ClientConfig()
-        assert config.sparql_fallback is True
-
-    @pytest.mark.integration
-    def test_get_html_by_celex_id_integration(self) -> None:
-        """Integration test - may raise WAFChallengeError if blocked."""
-        with EURLexClient() as client:
-            try:
-                html = client.get_html_by_celex_id("32019R0947")
-                assert len(html) > 0
-            except WAFChallengeError:
-                pytest.skip("EUR-Lex is blocking requests with WAF challenge")
+        assert DEFAULT_CONFIG.sparql_fallback is True
 
 
 class TestGetHtmlByCellarUrl:
     """Tests for cellar URL fetching."""
 
-    def test_get_html_by_cellar_url_method(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Document content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            client = EURLexClient()
-            html = client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123-def456")
-            assert "Document content" in html
-
-    def test_get_html_by_cellar_url_applies_rate_limit(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            client = EURLexClient(request_delay=0.1)
-            client._last_request_time = time.monotonic()
-            start = time.monotonic()
-            client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
-            elapsed = time.monotonic() - start
-            assert elapsed >= 0.05  # Should have waited
-
-    def test_get_html_by_cellar_url_raises_waf_error(self) -> None:
-        waf_html = '<script src="https://awswaf.com/challenge.js"></script>'
-        mock_response = MagicMock()
-        mock_response.text = waf_html
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            config = ClientConfig(sparql_fallback=False)
-            client = EURLexClient(config=config)
-            with pytest.raises(WAFChallengeError):
-                client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
-
-    def test_get_html_by_cellar_url_convenience_function(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            html = get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
-            assert "Content" in html
-
-    def test_get_html_by_cellar_url_handles_url_with_suffix(self) -> None:
-        """Test URLs with suffixes like /DOC_1."""
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Document</body></html>"
-        mock_response.raise_for_status = MagicMock()
+    def test_get_html_by_cellar_url_method(self, stub_http: SimpleNamespace, client: EURLexClient) -> None:
+        stub_http.response = _resp("<html><body>Document content</body></html>")
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
+        html = client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123-def456")
+        assert "Document content" in html
 
-            client = EURLexClient()
-            html = client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123/DOC_1")
-            assert "Document" in html
+    def test_get_html_by_cellar_url_applies_rate_limit(
+        self, stub_http: SimpleNamespace, frozen_clock: list[float]
+    ) -> None:
+        stub_http.response = _resp("<html></html>")
 
+        client = EURLexClient(request_delay=0.1)
+        client._last_request_time = FROZEN_NOW
+        client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
+        assert frozen_clock == [pytest.approx(0.1)]  # Should have waited
 
-class TestDetectIdType:
-    """Tests for detect_id_type function."""
+    def test_get_html_by_cellar_url_raises_waf_error(
+        self, stub_http: SimpleNamespace, waf_response: SimpleNamespace, strict_client: EURLexClient
+    ) -> None:
+        stub_http.response = waf_response
 
-    def test_detect_cellar_url(self) -> None:
-        assert detect_id_type("http://publications.europa.eu/resource/cellar/abc123") == "cellar_url"
-        assert detect_id_type("https://publications.europa.eu/resource/cellar/abc123") == "cellar_url"
+        with pytest.raises(WAFChallengeError):
+            strict_client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
 
-    def test_detect_celex_id(self) -> None:
-        assert detect_id_type("32019R0947") == "celex"
-        assert detect_id_type("52026XG00745") == "celex"
-        assert detect_id_type("32012L0029R(06)") == "celex"
+    def test_get_html_by_cellar_url_convenience_function(
+        self, stub_http: SimpleNamespace, ok_response: SimpleNamespace
+    ) -> None:
+        stub_http.response = ok_response
 
-    def test_detect_cellar_id_with_prefix(self) -> None:
-        assert detect_id_type("cellar:abc-123-def") == "cellar_id"
+        html = get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123")
+        assert "Content" in html
 
-    def test_detect_cellar_id_uuid(self) -> None:
-        # UUID format: 8-4-4-4-12 characters
-        assert detect_id_type("12345678-1234-1234-1234-123456789012") == "cellar_id"
+    def test_get_html_by_cellar_url_handles_url_with_suffix(
+        self, stub_http: SimpleNamespace, client: EURLexClient
+    ) -> None:
+        """Test URLs with suffixes like /DOC_1."""
+        stub_http.response = _resp("<html><body>Document</body></html>")
 
-    def test_detect_oj_reference(self) -> None:
-        # OJ references like C/2024/03709 are detected and fetched via SPARQL
-        assert detect_id_type("C/2026/00064") == "oj_reference"
-        assert detect_id_type("L/2024/01234") == "oj_reference"
-        assert detect_id_type("CA/2024/00001") == "oj_reference"
+        html = client.get_html_by_cellar_url("http://publications.europa.eu/resource/cellar/abc123/DOC_1")
+        assert "Document" in html
 
-    def test_detect_unknown_random_string(self) -> None:
-        assert detect_id_type("random-string") == "unknown"
 
+class TestDetectIdType:
+    """Tests for detect_id_type function."""
 
-class TestGetHtml:
-    """Tests for get_html unified function."""
+    @pytest.mark.parametrize(
+        ("identifier", "expected"),
+        [
+            ("http://publications.europa.eu/resource/cellar/abc123", "cellar_url"),
+            ("https://publications.europa.eu/resource/cellar/abc123", "cellar_url"),
+            ("32019R0947", "celex"),
+            ("52026XG00745", "celex"),
+            ("32012L0029R(06)", "celex"),
+            ("cellar:abc-123-def", "cellar_id"),
+            # UUID format: 8-4-4-4-12 characters
+            ("12345678-1234-1234-1234-123456789012", "cellar_id"),
+            # OJ references like C/2024/03709 are detected and fetched via SPARQL
+            ("C/2026/00064", "oj_reference"),
+            ("L/2024/01234", "oj_reference"),
+            ("CA/2024/00001", "oj_reference"),
+            ("random-string", "unknown"),
+        ],
+    )
+    def test_detect_id_type(self, identifier: str, expected: str) -> None:
+        assert detect_id_type(identifier) == expected
+
+    def test_results_are_memoized(self) -> None:
+        detect_id_type.cache_clear()
+        assert detect_id_type("32019R0947") == "celex"
+        assert detect_id_type("32019R0947") == "celex"
+        assert detect_id_type.cache_info().hits == 1
 
-    def test_get_html_with_celex_id(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>CELEX content</body></html>"
-        mock_response.raise_for_status = MagicMock()
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
+@pytest.mark.usefixtures("cellar_lookup")
+class TestGetHtml:
+    """Tests for get_html unified function."""
 
-            html = get_html("32019R0947")
-            assert "CELEX content" in html
+    def test_get_html_with_celex_id(self, stub_http: SimpleNamespace) -> None:
+        stub_http.response = _resp("<html><body>CELEX content</body></html>")
 
-    def test_get_html_with_cellar_url(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Cellar URL content</body></html>"
-        mock_response.raise_for_status = MagicMock()
+        html = get_html("32019R0947")
+        assert "CELEX content" in html
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
+    def test_get_html_with_cellar_url(self, stub_http: SimpleNamespace) -> None:
+        stub_http.response = _resp("<html><body>Cellar URL content</body></html>")
 
-            html = get_html("http://publications.europa.eu/resource/cellar/abc123")
-            assert "Cellar URL content" in html
+        html = get_html("http://publications.europa.eu/resource/cellar/abc123")
+        assert "Cellar URL content" in html
 
-    def test_get_html_with_oj_reference_uses_sparql_lookup(self) -> None:
+    def test_get_html_with_oj_reference_uses_sparql_lookup(
+        self, stub_http: SimpleNamespace, cellar_lookup: SimpleNamespace
+    ) -> None:
         """OJ references are looked up via SPARQL."""
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>OJ content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with (
-            patch.object(EURLexClient, "_get_client") as mock_get_client,
-            patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup,
-        ):
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-            mock_lookup.return_value = "http://publications.europa.eu/resource/cellar/abc123"
-
-            html = get_html("C/2026/00064")
-            assert "OJ content" in html
-            mock_lookup.assert_called_once_with("C/2026/00064")
+        stub_http.response = _resp("<html><body>OJ content</body></html>")
+        cellar_lookup.cellar_url = "http://publications.europa.eu/resource/cellar/abc123"
+
+        html = get_html("C/2026/00064")
+        assert "OJ content" in html
+        assert cellar_lookup.calls == ["C/2026/00064"]
 
     def test_get_html_with_unknown_raises_error_when_sparql_fails(self) -> None:
         """If SPARQL lookup returns None, a ValueError is raised."""
-        with patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup:
-            mock_lookup.return_value = None
-
-            with pytest.raises(ValueError, match="SPARQL lookup found no results"):
-                get_html("invalid-id-12345")
+        with pytest.raises(ValueError, match=NO_CELLAR_URL_ERROR):
+            get_html("invalid-id-12345")
 
 
+@pytest.mark.usefixtures("cellar_lookup")
 class TestFetchDocuments:
     """Tests for fetch_documents batch function."""
 
-    def test_fetch_documents_mixed_types(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-
-            results = fetch_documents(
-                [
-                    "32019R0947",  # CELEX
-                    "http://publications.europa.eu/resource/cellar/abc123",  # URL
-                ]
-            )
-            assert len(results) == 2
-            assert "32019R0947" in results
-            assert "http://publications.europa.eu/resource/cellar/abc123" in results
-
-    def test_fetch_documents_skip_errors(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with (
-            patch.object(EURLexClient, "_get_client") as mock_get_client,
-            patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup,
-        ):
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-            # SPARQL lookup fails, so unknown ID will be skipped
-            mock_lookup.return_value = None
-
-            # Include an unknown ID type that will be skipped
-            results = fetch_documents(
-                [
-                    "32019R0947",
-                    "invalid-id-12345",  # Unknown type, SPARQL fails - will be skipped
-                ],
-                on_error="skip",
-            )
-
-            assert len(results) == 1
-            assert "32019R0947" in results
-
-    def test_fetch_documents_include_errors(self) -> None:
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>Content</body></html>"
-        mock_response.raise_for_status = MagicMock()
-
-        with (
-            patch.object(EURLexClient, "_get_client") as mock_get_client,
-            patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup,
-        ):
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-            # SPARQL lookup fails
-            mock_lookup.return_value = None
-
-            results = fetch_documents(
-                [
-                    "32019R0947",
-                    "invalid-id-12345",  # Unknown type, SPARQL fails
-                ],
-                on_error="include",
-            )
-
-            assert len(results) == 2
-            assert isinstance(results["32019R0947"], str)
-            assert isinstance(results["invalid-id-12345"], Exception)
+    def test_fetch_documents_mixed_types(self, stub_http: SimpleNamespace, ok_response: SimpleNamespace) -> None:
+        stub_http.response = ok_response
 
-    def test_fetch_documents_raise_errors(self) -> None:
-        with (
-            patch.object(EURLexClient, "_get_client"),
-            patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup,
-            pytest.raises(ValueError),
-        ):
-            mock_lookup.return_value = None
-            fetch_documents(["invalid-id-12345"], on_error="raise")
+        results = fetch_documents(
+            [
+                "32019R0947",  # CELEX
+                "http://publications.europa.eu/resource/cellar/abc123",  # URL
+            ]
+        )
+        assert results.keys() == {"32019R0947", "http://publications.europa.eu/resource/cellar/abc123"}
+
+    def test_fetch_documents_skip_errors(self, stub_http: SimpleNamespace, ok_response: SimpleNamespace) -> None:
+        stub_http.response = ok_response
+
+        # Include an unknown ID type; its SPARQL lookup fails, so it is skipped
+        results = fetch_documents(
+            [
+                "32019R0947",
+                "invalid-id-12345",  # Unknown type, SPARQL fails - will be skipped
+            ],
+            on_error="skip",
+        )
 
-    def test_fetch_documents_with_oj_reference(self) -> None:
-        """OJ references are fetched via SPARQL lookup."""
-        mock_response = MagicMock()
-        mock_response.text = "<html><body>OJ content</body></html>"
-        mock_response.raise_for_status = MagicMock()
+        assert results.keys() == {"32019R0947"}
 
-        with (
-            patch.object(EURLexClient, "_get_client") as mock_get_client,
-            patch("eurlxp.sparql.lookup_cellar_url") as mock_lookup,
-        ):
-            mock_client = MagicMock()
-            mock_client.get.return_value = mock_response
-            mock_get_client.return_value = mock_client
-            mock_lookup.return_value = "http://publications.europa.eu/resource/cellar/abc123"
+    def test_fetch_documents_include_errors(self, stub_http: SimpleNamespace, ok_response: SimpleNamespace) -> None:
+        stub_http.response = ok_response
 
-            results = fetch_documents(["C/2026/00064"])
+        results = fetch_documents(
+            [
+                "32019R0947",
+                "invalid-id-12345",  # Unknown type, SPARQL fails
+            ],
+            on_error="include",
+        )
 
-            assert len(results) == 1
-            assert "C/2026/00064" in results
-            assert "OJ content" in results["C/2026/00064"]
-            mock_lookup.assert_called_once_with("C/2026/00064")
+        assert results.keys() == {"32019R0947", "invalid-id-12345"}
+        assert isinstance(results["32019R0947"], str)
+        assert isinstance(results["invalid-id-12345"], Exception)
 
+    @pytest.mark.usefixtures("stub_http")
+    def test_fetch_documents_raise_errors(self) -> None:
+        with pytest.raises(ValueError):
+            fetch_documents(["invalid-id-12345"], on_error="raise")
 
-class TestConvenienceFunctions:
-    """Tests for convenience functions."""
+    def test_fetch_documents_with_oj_reference(
+        self, stub_http: SimpleNamespace, cellar_lookup: SimpleNamespace
+    ) -> None:
+        """OJ references are fetched via SPARQL lookup."""
+        stub_http.response = _resp("<html><body>OJ content</body></html>")
+        cellar_lookup.cellar_url = "http://publications.europa.eu/resource/cellar/abc123"
 
-    @pytest.mark.integration
-    def test_get_html_by_celex_id_function(self) -> None:
-        from eurlxp import WAFChallengeError, get_html_by_celex_id
+        results = fetch_documents(["C/2026/00064"])
 
-        try:
-            html = get_html_by_celex_id("32019R0947")
-            assert len(html) > 0
-        except WAFChallengeError:
-            pytest.skip("EUR-Lex is blocking requests with WAF challenge")
+        assert results.keys() == {"C/2026/00064"}
+        assert "OJ content" in results["C/2026/00064"]
+        assert cellar_lookup.calls == ["C/2026/00064"]
 
 
 class TestRetryLogic:
     """Tests for HTTP retry logic on transient errors."""
 
+    @pytest.fixture(autouse=True)
+    def slept(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        """Record retry back-off sleeps instead of waiting them out."""
+        delays: list[float] = []
+        monkeypatch.setattr("eurlxp.client.time.sleep", delays.append)
+        return delays
+
     def test_client_config_has_retry_defaults(self) -> None:
         """ClientConfig should have default retry settings."""
         from eurlxp.client import (
@@ -513,7 +490,7 @@ class TestRetryLogic:
             DEFAULT_RETRY_DELAY,
         )
 
-        config = ClientConfig()
+        config = DEFAULT_CONFIG
         assert config.max_retries == DEFAULT_MAX_RETRIES
         assert config.retry_delay == DEFAULT_RETRY_DELAY
         assert config.retry_backoff == DEFAULT_RETRY_BACKOFF
@@ -525,93 +502,68 @@ class TestRetryLogic:
         assert config.retry_delay == 3.0
         assert config.retry_backoff == 3.0
 
-    def test_retry_on_500_error(self) -> None:
+    def test_retry_on_500_error(self, stub_http: SimpleNamespace, slept: list[float]) -> None:
         """Client should retry on HTTP 500 errors."""
-        import httpx
-
         from eurlxp.client import RETRYABLE_STATUS_CODES
 
         assert 500 in RETRYABLE_STATUS_CODES
 
         # Create a mock that fails twice then succeeds
         call_count = 0
-        mock_response_success = MagicMock()
-        mock_response_success.text = "<html>Success</html>"
-        mock_response_success.raise_for_status = MagicMock()
+        mock_response_success = _resp("<html>Success</html>")
+        error = httpx.HTTPStatusError("Server Error", request=_REQUEST, response=_resp(status_code=500))
 
-        mock_response_error = MagicMock()
-        mock_response_error.status_code = 500
-
-        def mock_get(_url: str) -> MagicMock:
+        def mock_get(_url: str) -> SimpleNamespace:
             nonlocal call_count
             call_count += 1
             if call_count < 3:
-                error = httpx.HTTPStatusError("Server Error", request=MagicMock(), response=mock_response_error)
                 raise error
             return mock_response_success
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = mock_get
-            mock_get_client.return_value = mock_client
+        stub_http.get = mock_get
 
-            # Use minimal retry delay for faster test
-            config = ClientConfig(max_retries=3, retry_delay=0.01, retry_backoff=1.0)
-            with EURLexClient(config=config) as client:
-                html = client.get_html_by_celex_id("32019R0947")
-                assert "Success" in html
-                assert call_count == 3  # 2 failures + 1 success
+        config = ClientConfig(max_retries=3, retry_delay=0.01, retry_backoff=1.0)
+        with EURLexClient(config=config) as client:
+            html = client.get_html_by_celex_id("32019R0947")
+            assert "Success" in html
+            assert call_count == 3  # 2 failures + 1 success
+            assert slept == [0.01, 0.01]
 
-    def test_retry_exhausted_raises_error(self) -> None:
+    def test_retry_exhausted_raises_error(self, stub_http: SimpleNamespace) -> None:
         """Client should raise error after max retries."""
-        import httpx
-
-        mock_response_error = MagicMock()
-        mock_response_error.status_code = 500
+        error = httpx.HTTPStatusError("Server Error", request=_REQUEST, response=_resp(status_code=500))
 
         def mock_get(_url: str) -> None:
-            error = httpx.HTTPStatusError("Server Error", request=MagicMock(), response=mock_response_error)
             raise error
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = mock_get
-            mock_get_client.return_value = mock_client
+        stub_http.get = mock_get
 
-            # Use minimal retry delay for faster test
-            config = ClientConfig(max_retries=2, retry_delay=0.01, retry_backoff=1.0)
-            with EURLexClient(config=config) as client, pytest.raises(httpx.HTTPStatusError):
-                client.get_html_by_celex_id("32019R0947")
+        config = ClientConfig(max_retries=2, retry_delay=0.01, retry_backoff=1.0)
+        with EURLexClient(config=config) as client, pytest.raises(httpx.HTTPStatusError):
+            client.get_html_by_celex_id("32019R0947")
 
-    def test_no_retry_on_non_retryable_error(self) -> None:
+    def test_no_retry_on_non_retryable_error(self, stub_http: SimpleNamespace) -> None:
         """Client should not retry on non-retryable errors (e.g., 404)."""
-        import httpx
-
         from eurlxp.client import RETRYABLE_STATUS_CODES
 
         assert 404 not in RETRYABLE_STATUS_CODES
 
         call_count = 0
-        mock_response_error = MagicMock()
-        mock_response_error.status_code = 404
+        error = httpx.HTTPStatusError("Not Found", request=_REQUEST, response=_resp(status_code=404))
 
         def mock_get(_url: str) -> None:
             nonlocal call_count
             call_count += 1
-            error = httpx.HTTPStatusError("Not Found", request=MagicMock(), response=mock_response_error)
             raise error
 
-        with patch.object(EURLexClient, "_get_client") as mock_get_client:
-            mock_client = MagicMock()
-            mock_client.get.side_effect = mock_get
-            mock_get_client.return_value = mock_client
+        stub_http.get = mock_get
 
-            config = ClientConfig(max_retries=3, retry_delay=0.01)
-            with EURLexClient(config=config) as client, pytest.raises(httpx.HTTPStatusError):
-                client.get_html_by_celex_id("32019R0947")
+        config = ClientConfig(max_retries=3, retry_delay=0.01)
+        with EURLexClient(config=config) as client, pytest.raises(httpx.HTTPStatusError):
+            client.get_html_by_celex_id("32019R0947")
 
-            # Should only have called once (no retries)
-            assert call_count == 1
+        # Should only have called once (no retries)
+        assert call_count == 1
 
     def test_retry_on_502_503_504_errors(self) -> None:
         """Client should retry on all retryable status codes."""
@@ -1,5 +1,9 @@
 """Tests for the parser module."""
 
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
 from eurlxp.parser import (
     get_celex_id,
     get_possible_celex_ids,
@@ -7,23 +11,25 @@ from eurlxp.parser import (
     parse_article_paragraphs,
     parse_celex_id,
     parse_html,
+    parse_tree,
 )
 
 
 class TestCelexId:
     """Tests for CELEX ID functions."""
 
-    def test_get_celex_id_year_first(self) -> None:
-        assert get_celex_id("2019/947") == "32019R0947"
-
-    def test_get_celex_id_year_second(self) -> None:
-        assert get_celex_id("947/2019") == "32019R0947"
-
-    def test_get_celex_id_with_document_type(self) -> None:
-        assert get_celex_id("2019/947", document_type="L") == "32019L0947"
-
-    def test_get_celex_id_with_sector(self) -> None:
-        assert get_celex_id("2019/947", sector_id="5") == "52019R0947"
+    @pytest.mark.parametrize(
+        ("reference", "kwargs", "expected"),
+        [
+            ("2019/947", {}, "32019R0947"),
+            ("947/2019", {}, "32019R0947"),
+            ("2019/947", {"document_type": "L"}, "32019L0947"),
+            ("2019/947", {"sector_id": "5"}, "52019R0947"),
+        ],
+        ids=["year_first", "year_second", "document_type", "sector"],
+    )
+    def test_get_celex_id(self, reference: str, kwargs: dict[str, str], expected: str) -> None:
+        assert get_celex_id(reference, **kwargs) == expected
 
     def test_get_possible_celex_ids_contains_expected(self) -> None:
         possible = get_possible_celex_ids("2019/947")
@@ -53,54 +59,53 @@ class TestParseArticleParagraphs:
 class TestParseHtml:
     """Tests for HTML parsing."""
 
-    def test_parse_simple_html(self) -> None:
-        html = '<html><body><p class="normal">Text</p></body></html>'
-        df = parse_html(html)
-        assert len(df) == 1
-        assert df[0, "text"] == "Text"
-        assert df[0, "type"] == "text"
-
-    def test_parse_invalid_html(self) -> None:
-        df = parse_html("<html")
-        assert len(df) == 0
-
-    def test_parse_empty_html(self) -> None:
-        df = parse_html("<html></html>")
-        assert len(df) == 0
-
-    def test_parse_with_document_title(self) -> None:
-        html = """<html><body>
-            <p class="doc-ti">REGULATION</p>
-            <p class="normal">Content text</p>
-        </body></html>"""
-        df = parse_html(html)
-        assert len(df) == 1
-        assert df[0, "document"] == "REGULATION"
-
-    def test_parse_with_article(self) -> None:
-        html = """<html><body>
-            <p class="ti-art">Article 1</p>
-            <p class="normal">Article content</p>
-        </body></html>"""
-        df = parse_html(html)
-        assert len(df) == 1
-        assert df[0, "article"] == "1"
-
-    def test_parse_with_group(self) -> None:
-        html = """<html><body>
-            <p class="ti-grseq-1">Group Title</p>
-            <p class="normal">Group content</p>
-        </body></html>"""
+    @pytest.mark.parametrize(
+        ("html", "expected"),
+        [
+            (
+                '<html><body><p class="normal">Text</p></body></html>',
+                {"text": "Text", "type": "text"},
+            ),
+            (
+                '<html><body><p class="doc-ti">REGULATION</p><p class="normal">Content text</p></body></html>',
+                {"document": "REGULATION"},
+            ),
+            (
+                '<html><body><p class="ti-art">Article 1</p><p class="normal">Article content</p></body></html>',
+                {"article": "1"},
+            ),
+            (
+                '<html><body><p class="ti-grseq-1">Group Title</p><p class="normal">Group content</p></body></html>',
+                {"group": "Group Title"},
+            ),
+            (
+                '<html><body><p class="normal">1. First paragraph</p></body></html>',
+                {"paragraph": "1", "text": "First paragraph"},
+            ),
+        ],
+        ids=["simple", "document_title", "article", "group", "numbered_paragraph"],
+    )
+    def test_parse_single_text_row(self, html: str, expected: dict[str, str]) -> None:
         df = parse_html(html)
         assert len(df) == 1
-        assert df[0, "group"] == "Group Title"
-
-    def test_parse_numbered_paragraph(self) -> None:
-        html = '<html><body><p class="normal">1. First paragraph</p></body></html>'
-        df = parse_html(html)
-        assert len(df) == 1
-        assert df[0, "paragraph"] == "1"
-        assert df[0, "text"] == "First paragraph"
+        assert df.row(0, named=True).items() >= expected.items()
+
+    @pytest.mark.parametrize("html", ["<html", "<html></html>"], ids=["invalid", "empty"])
+    def test_parse_without_text_rows(self, html: str) -> None:
+        assert len(parse_html(html)) == 0
+
+    def test_parse_html_column_types_do_not_depend_on_content(self) -> None:
+        df = parse_html('<html><body><p class="normal">Text</p></body></html>')
+        assert df.schema == {
+            "text": pl.String,
+            "type": pl.String,
+            "ref": pl.List(pl.String),
+            "document": pl.String,
+            "article": pl.String,
+            "paragraph": pl.String,
+            "group": pl.String,
+            "section": pl.String,
+        }
 
     def test_parse_metadata_propagation_per_article(self) -> None:
         """Regression: article/group/section must reflect position, not final values."""
@@ -119,27 +124,16 @@ class TestParseHtml:
             <p class="normal">(1) Third article first paragraph.</p>
         </body></html>"""
         df = parse_html(html)
-        assert len(df) == 4
-
-        # Article 1 rows
-        assert df[0, "article"] == "1"
-        assert df[0, "section"] == "GENERAL PROVISIONS"
-        assert df[0, "group"] == "Chapter I Scope"
-        assert df[0, "paragraph"] == "1"
-        assert df[1, "article"] == "1"
-        assert df[1, "paragraph"] == "2"
 
-        # Article 2 row
-        assert df[2, "article"] == "2"
-        assert df[2, "section"] == "GENERAL PROVISIONS"
-        assert df[2, "group"] == "Chapter I Scope"
-        assert df[2, "paragraph"] == "1"
-
-        # Article 3 row (different section and group)
-        assert df[3, "article"] == "3"
-        assert df[3, "section"] == "FINAL PROVISIONS"
-        assert df[3, "group"] == "Chapter II Entry into force"
-        assert df[3, "paragraph"] == "1"
+        expected = pl.DataFrame(
+            {
+                "article": ["1", "1", "2", "3"],
+                "paragraph": ["1", "2", "1", "1"],
+                "section": ["GENERAL PROVISIONS"] * 3 + ["FINAL PROVISIONS"],
+                "group": ["Chapter I Scope"] * 3 + ["Chapter II Entry into force"],
+            }
+        )
+        assert_frame_equal(df.select(expected.columns), expected)
 
     def test_preamble_has_no_article(self) -> None:
         """Preamble text before any article should not have article metadata."""
@@ -161,69 +155,91 @@ class TestParseHtml:
         assert df[2, "article"] == "1"
 
 
-class TestParseCelexId:
-    """Tests for CELEX ID parsing and validation."""
+class TestParseTree:
+    """Tests for parsing pre-parsed lxml trees."""
 
-    def test_parse_standard_celex_id(self) -> None:
-        result = parse_celex_id("32019R0947")
-        assert result is not None
-        assert result["sector"] == "3"
-        assert result["year"] == "2019"
-        assert result["doc_type"] == "R"
-        assert result["number"] == "0947"
-        assert result["suffix"] is None
-
-    def test_parse_celex_id_with_suffix(self) -> None:
-        result = parse_celex_id("32012L0029R(06)")
-        assert result is not None
-        assert result["sector"] == "3"
-        assert result["year"] == "2012"
-        assert result["doc_type"] == "L"
-        assert result["number"] == "0029"
-        assert result["suffix"] == "R(06)"
-
-    def test_parse_celex_id_sector_5(self) -> None:
-        result = parse_celex_id("52026XG00745")
-        assert result is not None
-        assert result["sector"] == "5"
-        assert result["year"] == "2026"
-        assert result["doc_type"] == "XG"
-        assert result["number"] == "00745"
+    def test_matches_parse_html(self, sample_html_with_groups: str) -> None:
+        from lxml import etree
 
-    def test_parse_celex_id_budget_type(self) -> None:
-        result = parse_celex_id("32026B00249")
-        assert result is not None
-        assert result["sector"] == "3"
-        assert result["doc_type"] == "B"
+        tree = etree.fromstring(sample_html_with_groups.encode())
+        assert parse_tree(tree).to_dicts() == parse_html(sample_html_with_groups).to_dicts()
+
+    def test_namespaced_xhtml(self) -> None:
+        from lxml import etree
 
-    def test_parse_oj_reference_returns_none(self) -> None:
-        """OJ series references like C/2026/00064 are not CELEX IDs."""
-        result = parse_celex_id("C/2026/00064")
-        assert result is None
+        html = """<html xmlns="http://www.w3.org/1999/xhtml"><body>
+            <p class="oj-ti-art">Article 1</p>
+            <p class="oj-normal">1. First <span>paragraph</span>.</p>
+        </body></html>"""
+        df = parse_tree(etree.fromstring(html.encode()))
+        assert len(df) == 1
+        assert df[0, "text"] == "Firstparagraph."
+        assert df[0, "article"] == "1"
+        assert df[0, "paragraph"] == "1"
 
-    def test_parse_empty_string_returns_none(self) -> None:
-        result = parse_celex_id("")
-        assert result is None
+    def test_empty_tree(self) -> None:
+        from lxml import etree
 
-    def test_parse_invalid_format_returns_none(self) -> None:
-        result = parse_celex_id("not-a-celex-id")
-        assert result is None
+        assert len(parse_tree(etree.fromstring(b"<html></html>"))) == 0
 
-    def test_parse_celex_id_invalid_year_returns_none(self) -> None:
-        result = parse_celex_id("31800R0001")  # Year too old
-        assert result is None
+
+class TestParseCelexId:
+    """Tests for CELEX ID parsing and validation."""
+
+    @pytest.mark.parametrize(
+        ("celex_id", "expected"),
+        [
+            (
+                "32019R0947",
+                {"sector": "3", "year": "2019", "doc_type": "R", "number": "0947", "suffix": None},
+            ),
+            (
+                "32012L0029R(06)",
+                {"sector": "3", "year": "2012", "doc_type": "L", "number": "0029", "suffix": "R(06)"},
+            ),
+            ("52026XG00745", {"sector": "5", "year": "2026", "doc_type": "XG", "number": "00745"}),
+            ("32026B00249", {"sector": "3", "doc_type": "B"}),
+        ],
+        ids=["standard", "with_suffix", "sector_5", "budget_type"],
+    )
+    def test_parse_celex_id(self, celex_id: str, expected: dict[str, str | None]) -> None:
+        result = parse_celex_id(celex_id)
+        assert result is not None
+        assert result.items() >= expected.items()
+
+    def test_parse_celex_id_returns_fresh_dict(self) -> None:
+        """Parsing is memoized, but callers get their own dict to modify."""
+        first = parse_celex_id("32019R0947")
+        assert first is not None
+        first["suffix"] = "changed"
+        assert parse_celex_id("32019R0947") == {**first, "suffix": None}
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "C/2026/00064",  # OJ series references are not CELEX IDs
+            "",
+            "not-a-celex-id",
+            "31800R0001",  # Year too old
+            "32101R0001",  # Year too far ahead
+            "32019R0",  # Number too short
+            None,
+        ],
+        ids=["oj_reference", "empty", "invalid_format", "invalid_year", "future_year", "too_short", "none"],
+    )
+    def test_parse_non_celex_returns_none(self, value: str | None) -> None:
+        assert parse_celex_id(value) is None
 
 
 class TestIsValidCelexId:
     """Tests for CELEX ID validation."""
 
-    def test_valid_celex_ids(self) -> None:
-        assert is_valid_celex_id("32019R0947") is True
-        assert is_valid_celex_id("32012L0029R(06)") is True
-        assert is_valid_celex_id("52026XG00745") is True
-        assert is_valid_celex_id("32026B00249") is True
+    @pytest.mark.parametrize("celex_id", ["32019R0947", "32012L0029R(06)", "52026XG00745", "32026B00249"])
+    def test_valid_celex_ids(self, celex_id: str) -> None:
+        assert is_valid_celex_id(celex_id) is True
 
-    def test_invalid_celex_ids(self) -> None:
-        assert is_valid_celex_id("C/2026/00064") is False  # OJ reference
-        assert is_valid_celex_id("") is False
-        assert is_valid_celex_id("invalid") is False
+    @pytest.mark.parametrize(
+        "value", ["C/2026/00064", "", "invalid", None], ids=["oj_reference", "empty", "invalid", "none"]
+    )
+    def test_invalid_celex_ids(self, value: str | None) -> None:
+        assert is_valid_celex_id(value) is False